@@ -1,5 +1,4 @@
 from .config import load_config, Config, InstanceConfig, ServiceConfig, DEFAULT_CONFIG_PATH
-from .client import LokiClient, PrometheusClient, TempoClient
 
 __all__ = [
     "load_config",
@@ -11,3 +10,13 @@ __all__ = [
     "PrometheusClient",
     "TempoClient",
 ]
+
+_LAZY_CLIENTS = {"LokiClient", "PrometheusClient", "TempoClient"}
+
+
+def __getattr__(name: str):
+    # Clients pull in httpx, so only import them when they are first accessed
+    if name in _LAZY_CLIENTS:
+        from . import client
+        return getattr(client, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
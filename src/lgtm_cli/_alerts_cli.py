@@ -0,0 +1,231 @@
+"""`lgtm alerts` commands, imported only when the group is invoked."""
+
+import re
+import sys
+from datetime import timedelta
+
+import click
+
+from .cli import (
+    DEFAULT_SILENCE_DURATION,
+    _apply_options,
+    _config_not_found_exit,
+    _format_rfc3339,
+    _get_now,
+    get_client,
+    get_config,
+    get_instance_or_exit,
+    output_error,
+    safe_output,
+)
+
+
+_DURATION_RE = re.compile(r'^(\d+)([smhd])$', re.IGNORECASE)
+_MATCHER_RE = re.compile(r'^([^=!~]+)(=~|!~|!=|=)(.*)$')
+_DURATION_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+
+def parse_duration(duration: str) -> timedelta:
+    """Parse duration string like '2h', '30m', '1d' to timedelta."""
+    match = _DURATION_RE.match(duration)
+    if not match:
+        raise click.BadParameter(f"Invalid duration format: {duration}. Use format like '2h', '30m', '1d'")
+    value = int(match.group(1))
+    unit = match.group(2).lower()
+    # The regex only admits units present in _DURATION_UNITS
+    return timedelta(**{_DURATION_UNITS[unit]: value})
+
+
+def parse_matcher(matcher: str) -> dict:
+    """Parse matcher string like 'alertname=HighCPU' or 'severity=~warning|critical'."""
+    match = _MATCHER_RE.match(matcher)
+    if not match:
+        raise click.BadParameter(f"Invalid matcher format: {matcher}. Use format like 'label=value' or 'label=~regex'")
+    name = match.group(1)
+    op = match.group(2)
+    value = match.group(3)
+    return {
+        "name": name,
+        "value": value,
+        "isRegex": op in ("=~", "!~"),
+        "isEqual": op in ("=", "=~"),
+    }
+
+
+@click.group()
+@click.pass_context
+def alerts(ctx):
+    """Query Grafana Alerting/Alertmanager."""
+    if not get_config(ctx):
+        _config_not_found_exit(ctx)
+    instance = get_instance_or_exit(ctx)
+    if not instance.alerting:
+        output_error(
+            f"Alerting not configured for instance '{instance.name}'",
+            suggestions=["Add an 'alerting' section to this instance in config",
+                          "Or run 'lgtm discover' to auto-configure"],
+            ctx=ctx,
+        )
+        sys.exit(1)
+    from .client import AlertingClient
+    ctx.obj["client"] = get_client(ctx, AlertingClient, instance.alerting)
+
+
+alert_filter_options = _apply_options([
+    click.option("--filter", "-f", "filters", multiple=True, help="Filter alerts by label (e.g., 'alertname=HighCPU')"),
+    click.option("--receiver", "-r", help="Filter by receiver"),
+])
+
+
+@alerts.command("list")
+@alert_filter_options
+@click.option("--silenced/--no-silenced", default=True, help="Include silenced alerts")
+@click.option("--inhibited/--no-inhibited", default=True, help="Include inhibited alerts")
+@click.option("--active/--no-active", default=True, help="Include active alerts")
+@click.pass_context
+@safe_output()
+def alerts_list(ctx, filters: tuple[str, ...], receiver: str | None, silenced: bool, inhibited: bool, active: bool):
+    """List firing alerts.
+
+    Examples:
+
+      lgtm alerts list
+
+      lgtm alerts list --filter 'alertname=HighCPU'
+
+      lgtm alerts list --no-silenced --active
+    """
+    result = ctx.obj["client"].list_alerts(
+        filter=list(filters) if filters else None,
+        receiver=receiver,
+        silenced=silenced,
+        inhibited=inhibited,
+        active=active,
+    )
+    hints = [
+        "silence alert → lgtm alerts silence-create --matcher 'alertname=<name>' --duration 2h --comment '<reason>' --created-by '<you>'",
+        "group view → lgtm alerts groups",
+        "filter → lgtm alerts list --filter 'severity=critical'",
+    ]
+    return result, hints
+
+
+@alerts.command("groups")
+@alert_filter_options
+@click.pass_context
+@safe_output()
+def alerts_groups(ctx, filters: tuple[str, ...], receiver: str | None):
+    """List alerts grouped by receiver/labels.
+
+    Examples:
+
+      lgtm alerts groups
+
+      lgtm alerts groups --filter 'severity=critical'
+    """
+    result = ctx.obj["client"].list_alert_groups(
+        filter=list(filters) if filters else None,
+        receiver=receiver,
+    )
+    hints = [
+        "flat list → lgtm alerts list",
+        "filter → lgtm alerts groups --filter 'severity=critical'",
+    ]
+    return result, hints
+
+
+@alerts.command("silences")
+@click.option("--filter", "-f", "filters", multiple=True, help="Filter silences by label")
+@click.pass_context
+@safe_output()
+def alerts_silences(ctx, filters: tuple[str, ...]):
+    """List all silences.
+
+    Examples:
+
+      lgtm alerts silences
+
+      lgtm alerts silences --filter 'alertname=HighCPU'
+    """
+    result = ctx.obj["client"].list_silences(
+        filter=list(filters) if filters else None,
+    )
+    hints = [
+        "view silence → lgtm alerts silence-get <id>",
+        "delete silence → lgtm alerts silence-delete <id>",
+        "create silence → lgtm alerts silence-create --matcher 'alertname=<name>' --duration 2h --comment '<reason>' --created-by '<you>'",
+    ]
+    return result, hints
+
+
+@alerts.command("silence-get")
+@click.argument("silence_id")
+@click.pass_context
+@safe_output(["Use 'lgtm alerts silences' to list all silences"])
+def alerts_silence_get(ctx, silence_id: str):
+    """Get a specific silence by ID.
+
+    Examples:
+
+      lgtm alerts silence-get abc123-def456
+    """
+    result = ctx.obj["client"].get_silence(silence_id)
+    hints = [
+        f"delete this silence → lgtm alerts silence-delete {silence_id}",
+        "list all silences → lgtm alerts silences",
+    ]
+    return result, hints
+
+
+@alerts.command("silence-create")
+@click.option("--matcher", "-m", "matchers", multiple=True, required=True,
+              help="Matcher in format 'label=value' or 'label=~regex'. Can be specified multiple times.")
+@click.option("--duration", "-d", default=DEFAULT_SILENCE_DURATION,
+              help=f"Silence duration (e.g., '2h', '30m', '1d'). Default: {DEFAULT_SILENCE_DURATION}")
+@click.option("--comment", "-c", required=True, help="Comment explaining the silence")
+@click.option("--created-by", required=True, help="Creator identifier (e.g., email)")
+@click.pass_context
+@safe_output()
+def alerts_silence_create(ctx, matchers: tuple[str, ...], duration: str, comment: str, created_by: str):
+    """Create a new silence.
+
+    Examples:
+
+      lgtm alerts silence-create --matcher 'alertname=HighCPU' --duration 2h --comment "Maintenance" --created-by "user@example.com"
+
+      lgtm alerts silence-create -m 'alertname=HighCPU' -m 'severity=warning' -d 1h -c "Investigating" --created-by "ops"
+    """
+    parsed_matchers = [parse_matcher(m) for m in matchers]
+    delta = parse_duration(duration)
+    now = _get_now(ctx)
+    starts_at = _format_rfc3339(now)
+    ends_at = _format_rfc3339(now + delta)
+
+    result = ctx.obj["client"].create_silence(
+        matchers=parsed_matchers,
+        starts_at=starts_at,
+        ends_at=ends_at,
+        created_by=created_by,
+        comment=comment,
+    )
+    hints = [
+        "list silences → lgtm alerts silences",
+        "delete this silence → lgtm alerts silence-delete <silenceID from response>",
+    ]
+    return result, hints
+
+
+@alerts.command("silence-delete")
+@click.argument("silence_id")
+@click.pass_context
+@safe_output(["Use 'lgtm alerts silences' to list all silences"])
+def alerts_silence_delete(ctx, silence_id: str):
+    """Delete/expire a silence by ID.
+
+    Examples:
+
+      lgtm alerts silence-delete abc123-def456
+    """
+    ctx.obj["client"].delete_silence(silence_id)
+    hints = ["list silences → lgtm alerts silences"]
+    return {"message": f"Silence {silence_id} deleted successfully"}, hints
@@ -0,0 +1,167 @@
+"""`lgtm loki` commands, imported only when the group is invoked."""
+
+import sys
+
+import click
+
+from .cli import (
+    DEFAULT_LOKI_LIMIT,
+    _config_not_found_exit,
+    _count_results,
+    _get_now,
+    _get_output_mode,
+    get_client,
+    get_config,
+    get_default_times,
+    get_instance_or_exit,
+    output_error,
+    safe_output,
+    time_filter_options,
+    time_range_options,
+)
+
+
+@click.group()
+@click.pass_context
+def loki(ctx):
+    """Query Loki logs."""
+    if not get_config(ctx):
+        _config_not_found_exit(ctx)
+    instance = get_instance_or_exit(ctx)
+    if not instance.loki:
+        output_error(
+            f"Loki not configured for instance '{instance.name}'",
+            suggestions=["Add a 'loki' section to this instance in config",
+                          "Or run 'lgtm discover' to auto-configure"],
+            ctx=ctx,
+        )
+        sys.exit(1)
+    from .client import LokiClient
+    ctx.obj["client"] = get_client(ctx, LokiClient, instance.loki)
+
+
+@loki.command()
+@click.argument("query")
+@time_range_options
+@click.option("--limit", "-l", default=DEFAULT_LOKI_LIMIT, help=f"Max entries (default: {DEFAULT_LOKI_LIMIT})")
+@click.option("--direction", "-d", type=click.Choice(["backward", "forward"]), default="backward")
+@click.pass_context
+@safe_output(["Check your LogQL syntax", "Use 'lgtm loki labels' to discover available labels"])
+def query(ctx, query: str, start: str | None, end: str | None, limit: int, direction: str):
+    """Query logs with LogQL.
+
+    Examples:
+
+      lgtm loki query '{app="myapp"}'
+
+      lgtm loki query '{app="myapp"} |= "error"' --limit 100
+
+      lgtm loki query '{app="myapp"}' --start 2024-01-15T10:00:00Z --end 2024-01-15T11:00:00Z
+    """
+    if not (start and end):
+        default_start, default_end = get_default_times(now=_get_now(ctx))
+        start = start or default_start
+        end = end or default_end
+    client = ctx.obj["client"]
+    if _get_output_mode(ctx) == "ndjson":
+        # Paged and written as it arrives, so large --limit values keep memory flat
+        result = client.iter_query_range(query, start, end, direction=direction, limit=limit)
+    else:
+        result = client.query(
+            query=query,
+            start=start,
+            end=end,
+            limit=limit,
+            direction=direction,
+        )
+    count = _count_results(result)
+    hints = [
+        "narrow results → add label filter or line filter e.g. '|= \"error\"'",
+        "aggregate → lgtm loki instant 'count_over_time({...}[5m])'",
+    ]
+    if count is not None and count >= limit:
+        hints.insert(0, f"limit of {limit} reached → use --limit to increase or narrow your query")
+    return result, hints
+
+
+@loki.command()
+@click.argument("query")
+@click.option("--time", "-t", help="Evaluation time (RFC3339). Default: now")
+@click.pass_context
+@safe_output(["Check your LogQL syntax"])
+def instant(ctx, query: str, time: str | None):
+    """Run instant query (for metric queries like count_over_time).
+
+    Examples:
+
+      lgtm loki instant 'count_over_time({app="myapp"}[5m])'
+
+      lgtm loki instant 'sum by (level) (count_over_time({app="myapp"} | json [5m]))'
+    """
+    result = ctx.obj["client"].query_instant(query, time)
+    hints = [
+        "range query → lgtm loki query '{...}' to see raw logs",
+        "break down → add 'by (label)' to your aggregation",
+    ]
+    return result, hints
+
+
+@loki.command()
+@time_filter_options
+@click.pass_context
+@safe_output()
+def labels(ctx, start: str | None, end: str | None):
+    """List available labels.
+
+    Use this first to discover what labels are available before querying.
+    """
+    result = ctx.obj["client"].labels(start, end)
+    hints = ["get values → lgtm loki label-values <label>"]
+    return result, hints
+
+
+@loki.command("label-values")
+@click.argument("label")
+@time_filter_options
+@click.pass_context
+@safe_output(["Use 'lgtm loki labels' to see available labels"])
+def label_values(ctx, label: str, start: str | None, end: str | None):
+    """List values for a label.
+
+    Examples:
+
+      lgtm loki label-values app
+
+      lgtm loki label-values namespace
+    """
+    result = ctx.obj["client"].label_values(label, start, end)
+    hints = [
+        f"query with label → lgtm loki query '{{{label}=\"<value>\"}}'",
+        "see all labels → lgtm loki labels",
+    ]
+    return result, hints
+
+
+@loki.command()
+@click.argument("match", nargs=-1, required=True)
+@time_filter_options
+@click.option("--concurrency", type=click.IntRange(min=1), default=1,
+              help="Send one request per selector, this many at a time (default: 1, a single batched request)")
+@click.pass_context
+@safe_output()
+def series(ctx, match: tuple[str, ...], start: str | None, end: str | None, concurrency: int):
+    """List series matching selectors.
+
+    Examples:
+
+      lgtm loki series '{app="myapp"}'
+
+      lgtm loki series '{namespace="prod"}' '{namespace="staging"}'
+    """
+    if concurrency > 1 and len(match) > 1:
+        from .client import series_concurrently
+        result = series_concurrently(ctx.obj["client"], list(match), start, end, concurrency)
+    else:
+        result = ctx.obj["client"].series(list(match), start, end)
+    hints = ["query logs → lgtm loki query '<selector>'"]
+    return result, hints
@@ -0,0 +1,189 @@
+"""`lgtm prom` commands, imported only when the group is invoked."""
+
+import sys
+
+import click
+
+from .cli import (
+    DEFAULT_PROM_STEP,
+    _config_not_found_exit,
+    _get_now,
+    _get_output_mode,
+    get_client,
+    get_config,
+    get_default_times,
+    get_instance_or_exit,
+    output_error,
+    safe_output,
+    time_filter_options,
+    time_range_options,
+)
+
+
+@click.group()
+@click.pass_context
+def prom(ctx):
+    """Query Prometheus/Mimir metrics."""
+    if not get_config(ctx):
+        _config_not_found_exit(ctx)
+    instance = get_instance_or_exit(ctx)
+    if not instance.prometheus:
+        output_error(
+            f"Prometheus not configured for instance '{instance.name}'",
+            suggestions=["Add a 'prometheus' section to this instance in config",
+                          "Or run 'lgtm discover' to auto-configure"],
+            ctx=ctx,
+        )
+        sys.exit(1)
+    from .client import PrometheusClient
+    ctx.obj["client"] = get_client(ctx, PrometheusClient, instance.prometheus)
+
+
+@prom.command()
+@click.argument("query")
+@click.option("--time", "-t", help="Evaluation time (RFC3339). Default: now")
+@click.pass_context
+@safe_output(["Check your PromQL syntax", "Use 'lgtm prom labels' to discover available labels"])
+def query(ctx, query: str, time: str | None):
+    """Run instant query.
+
+    Examples:
+
+      lgtm prom query 'up{job="prometheus"}'
+
+      lgtm prom query 'rate(http_requests_total[5m])'
+    """
+    result = ctx.obj["client"].query(query, time)
+    hints = [
+        "time series → lgtm prom range '<query>' to see values over time",
+        "visualize → pipe range output to 'lgtm chart'",
+    ]
+    return result, hints
+
+
+@prom.command()
+@click.argument("query")
+@time_range_options
+@click.option("--step", default=DEFAULT_PROM_STEP, help=f"Resolution step (default: {DEFAULT_PROM_STEP})")
+@click.pass_context
+@safe_output(["Check your PromQL syntax"])
+def range(ctx, query: str, start: str | None, end: str | None, step: str):
+    """Run range query.
+
+    Examples:
+
+      lgtm prom range 'rate(http_requests_total[5m])'
+
+      lgtm prom range 'up' --step 5m --start 2024-01-15T10:00:00Z
+    """
+    if not (start and end):
+        default_start, default_end = get_default_times(now=_get_now(ctx))
+        start = start or default_start
+        end = end or default_end
+    client = ctx.obj["client"]
+    # ndjson output can be written series by series while the body is parsed
+    fetch = client.iter_query_range if _get_output_mode(ctx) == "ndjson" else client.query_range
+    result = fetch(
+        query=query,
+        start=start,
+        end=end,
+        step=step,
+    )
+    hints = [
+        "visualize → save output to file, then 'lgtm chart <file> -t \"Title\"'",
+        "finer resolution → use --step 15s or --step 30s",
+        "instant value → lgtm prom query '<query>' for current point-in-time",
+    ]
+    return result, hints
+
+
+@prom.command()
+@time_filter_options
+@click.pass_context
+@safe_output()
+def labels(ctx, start: str | None, end: str | None):
+    """List available labels.
+
+    Use this first to discover what labels are available.
+    """
+    result = ctx.obj["client"].labels(start, end)
+    hints = [
+        "get values → lgtm prom label-values <label>",
+        "list metric names → lgtm prom label-values __name__",
+    ]
+    return result, hints
+
+
+@prom.command("label-values")
+@click.argument("label")
+@time_range_options
+@click.option("--match", "-m", multiple=True, help="Only consider series matching this selector (repeatable)")
+@click.option("--limit", "-l", type=int, help="Max values to return")
+@click.pass_context
+@safe_output(["Use 'lgtm prom labels' to see available labels"])
+def prom_label_values(ctx, label: str, start: str | None, end: str | None, match: tuple[str, ...], limit: int | None):
+    """List values for a label.
+
+    Examples:
+
+      lgtm prom label-values job
+
+      lgtm prom label-values __name__  # List all metric names
+
+      lgtm prom label-values instance --match 'up{job="api"}'
+    """
+    if not (start and end):
+        default_start, default_end = get_default_times(now=_get_now(ctx))
+        start = start or default_start
+        end = end or default_end
+    result = ctx.obj["client"].label_values(label, start, end, match=list(match), limit=limit)
+    hints = [
+        f"query with label → lgtm prom query '<metric>{{{label}=\"<value>\"}}'",
+        "see all labels → lgtm prom labels",
+    ]
+    return result, hints
+
+
+@prom.command()
+@click.argument("match", nargs=-1, required=True)
+@time_filter_options
+@click.option("--concurrency", type=click.IntRange(min=1), default=1,
+              help="Send one request per selector, this many at a time (default: 1, a single batched request)")
+@click.pass_context
+@safe_output()
+def series(ctx, match: tuple[str, ...], start: str | None, end: str | None, concurrency: int):
+    """List series matching selectors.
+
+    Examples:
+
+      lgtm prom series 'up'
+
+      lgtm prom series 'http_requests_total{job="api"}'
+    """
+    if concurrency > 1 and len(match) > 1:
+        from .client import series_concurrently
+        result = series_concurrently(ctx.obj["client"], list(match), start, end, concurrency)
+    else:
+        result = ctx.obj["client"].series(list(match), start, end)
+    hints = ["query metric → lgtm prom query '<metric>{<labels>}'"]
+    return result, hints
+
+
+@prom.command()
+@click.option("--metric", "-m", help="Filter by metric name")
+@click.pass_context
+@safe_output()
+def metadata(ctx, metric: str | None):
+    """Get metric metadata.
+
+    Examples:
+
+      lgtm prom metadata
+
+      lgtm prom metadata --metric http_requests_total
+    """
+    result = ctx.obj["client"].metadata(metric)
+    hints = ["query metric → lgtm prom query '<metric_name>'"]
+    if not metric:
+        hints.insert(0, "filter by metric → lgtm prom metadata --metric <name>")
+    return result, hints
@@ -0,0 +1,140 @@
+"""`lgtm tempo` commands, imported only when the group is invoked."""
+
+import sys
+
+import click
+
+from .cli import (
+    DEFAULT_TEMPO_LIMIT,
+    DEFAULT_TIME_RANGE_MINUTES,
+    _config_not_found_exit,
+    _count_results,
+    _get_now,
+    _get_output_mode,
+    get_client,
+    get_config,
+    get_default_times_unix,
+    get_instance_or_exit,
+    output_error,
+    safe_output,
+)
+
+
+@click.group()
+@click.pass_context
+def tempo(ctx):
+    """Query Tempo traces."""
+    if not get_config(ctx):
+        _config_not_found_exit(ctx)
+    instance = get_instance_or_exit(ctx)
+    if not instance.tempo:
+        output_error(
+            f"Tempo not configured for instance '{instance.name}'",
+            suggestions=["Add a 'tempo' section to this instance in config",
+                          "Or run 'lgtm discover' to auto-configure"],
+            ctx=ctx,
+        )
+        sys.exit(1)
+    from .client import TempoClient
+    ctx.obj["client"] = get_client(ctx, TempoClient, instance.tempo)
+
+
+@tempo.command()
+@click.argument("trace_id")
+@click.pass_context
+@safe_output()
+def trace(ctx, trace_id: str):
+    """Get trace by ID.
+
+    Use this when you have a specific trace ID to investigate.
+
+    Examples:
+
+      lgtm tempo trace abc123def456
+    """
+    result = ctx.obj["client"].trace(trace_id)
+    hints = [
+        "search related → lgtm tempo search -q '{resource.service.name=\"<service>\"}'",
+        "find logs → lgtm loki query '{traceID=\"" + trace_id + "\"}'",
+    ]
+    return result, hints
+
+
+@tempo.command()
+@click.option("--query", "-q", help="TraceQL query")
+@click.option("--start", "-s", help=f"Start time (Unix seconds). Default: {DEFAULT_TIME_RANGE_MINUTES} minutes ago")
+@click.option("--end", "-e", help="End time (Unix seconds). Default: now")
+@click.option("--min-duration", help="Minimum duration (e.g., 100ms, 1s)")
+@click.option("--max-duration", help="Maximum duration")
+@click.option("--limit", "-l", default=DEFAULT_TEMPO_LIMIT, help=f"Max traces (default: {DEFAULT_TEMPO_LIMIT})")
+@click.pass_context
+@safe_output(["Check your TraceQL syntax", "Use 'lgtm tempo tags' to discover available tags"])
+def search(ctx, query: str | None, start: str | None, end: str | None,
+           min_duration: str | None, max_duration: str | None, limit: int):
+    """Search traces with TraceQL.
+
+    Examples:
+
+      lgtm tempo search -q '{resource.service.name="api"}'
+
+      lgtm tempo search -q '{status=error}' --min-duration 1s
+
+      lgtm tempo search --min-duration 500ms --limit 50
+    """
+    if not (start and end):
+        default_start, default_end = get_default_times_unix(now=_get_now(ctx))
+        start = start or default_start
+        end = end or default_end
+    client = ctx.obj["client"]
+    # ndjson output can be written trace by trace while the body is parsed
+    fetch = client.iter_search if _get_output_mode(ctx) == "ndjson" else client.search
+    result = fetch(
+        query=query,
+        start=start,
+        end=end,
+        min_duration=min_duration,
+        max_duration=max_duration,
+        limit=limit,
+    )
+    count = _count_results(result)
+    hints = [
+        "view trace → lgtm tempo trace <traceID>",
+        "filter slow → add --min-duration 1s",
+    ]
+    if count is not None and count >= limit:
+        hints.insert(0, f"limit of {limit} reached → use --limit to increase or narrow your query")
+    return result, hints
+
+
+@tempo.command()
+@click.pass_context
+@safe_output()
+def tags(ctx):
+    """List available tags.
+
+    Use this first to discover what tags/attributes are available.
+    """
+    result = ctx.obj["client"].tags()
+    hints = ["get values → lgtm tempo tag-values <tag>"]
+    return result, hints
+
+
+@tempo.command("tag-values")
+@click.argument("tag")
+@click.pass_context
+@safe_output(["Use 'lgtm tempo tags' to see available tags"])
+def tag_values(ctx, tag: str):
+    """List values for a tag.
+
+    Examples:
+
+      lgtm tempo tag-values service.name
+
+      lgtm tempo tag-values http.status_code
+    """
+    result = ctx.obj["client"].tag_values(tag)
+    hints = [
+        f"search with tag → lgtm tempo search -q '{{resource.{tag}=\"<value>\"}}'",
+        "see all tags → lgtm tempo tags",
+    ]
+    return result, hints
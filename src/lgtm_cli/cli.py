@@ -1,34 +1,58 @@
+import functools
+import importlib
 import json
+import os
 import sys
+import time
+from collections.abc import Iterator
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Final
 
 import click
 import yaml
 
-from .config import load_config, generate_stack_instances, write_config, DEFAULT_CONFIG_PATH
-from .client import LokiClient, PrometheusClient, TempoClient, AlertingClient, GrafanaCloudClient
+from . import timing
+from .config import LazyInstances, load_config, generate_stack_instances, read_yaml, write_config, DEFAULT_CONFIG_PATH
+
+try:
+    import orjson
+except ImportError:  # optional speedup, installed via the "fast" extra
+    orjson = None
 
 
 # Best practice defaults
-DEFAULT_TIME_RANGE_MINUTES = 15  # Start with narrow time range
-DEFAULT_LOKI_LIMIT = 50  # Reasonable limit for logs
-DEFAULT_TEMPO_LIMIT = 20  # Reasonable limit for traces
-DEFAULT_PROM_STEP = "60s"  # 1 minute resolution
+DEFAULT_TIME_RANGE_MINUTES: Final = 15  # Start with narrow time range
+DEFAULT_LOKI_LIMIT: Final = 50  # Reasonable limit for logs
+DEFAULT_TEMPO_LIMIT: Final = 20  # Reasonable limit for traces
+DEFAULT_PROM_STEP: Final = "60s"  # 1 minute resolution
+DEFAULT_SILENCE_DURATION_HOURS: Final = 2
+DEFAULT_SILENCE_DURATION: Final = f"{DEFAULT_SILENCE_DURATION_HOURS}h"
 
 
-def get_default_times(minutes: int = DEFAULT_TIME_RANGE_MINUTES) -> tuple[str, str]:
-    """Get default start/end times (RFC3339) for the last N minutes."""
-    now = datetime.now(timezone.utc)
-    start = now - timedelta(minutes=minutes)
-    return start.strftime("%Y-%m-%dT%H:%M:%SZ"), now.strftime("%Y-%m-%dT%H:%M:%SZ")
+def _format_rfc3339(dt: datetime) -> str:
+    """Format a UTC datetime as RFC3339 with second precision (e.g. 2024-01-15T10:00:00Z)."""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}Z"
 
 
-def get_default_times_unix(minutes: int = DEFAULT_TIME_RANGE_MINUTES) -> tuple[str, str]:
-    """Get default start/end times (Unix seconds) for the last N minutes."""
-    now = datetime.now(timezone.utc)
+def get_default_times(minutes: int = DEFAULT_TIME_RANGE_MINUTES, now: datetime | None = None) -> tuple[str, str]:
+    """Get default start/end times (RFC3339) for the last N minutes before now."""
+    now = now or datetime.now(timezone.utc)
     start = now - timedelta(minutes=minutes)
-    return str(int(start.timestamp())), str(int(now.timestamp()))
+    return _format_rfc3339(start), _format_rfc3339(now)
+
+
+def get_default_times_unix(minutes: int = DEFAULT_TIME_RANGE_MINUTES, now: datetime | None = None) -> tuple[str, str]:
+    """Get default start/end times (Unix seconds) for the last N minutes before now."""
+    end = int(now.timestamp()) if now else int(time.time())
+    return str(end - minutes * 60), str(end)
+
+
+def _get_now(ctx) -> datetime:
+    """Get the current UTC time, read once per invocation and shared by all commands."""
+    if "now" not in ctx.obj:
+        ctx.obj["now"] = datetime.now(timezone.utc)
+    return ctx.obj["now"]
 
 
 def _get_envelope(ctx) -> bool:
@@ -62,9 +86,119 @@ def _count_results(data) -> int | None:
     return None
 
 
+def _iter_records(data):
+    """Yield the individual records of an API response, for ndjson output."""
+    if isinstance(data, (list, Iterator)):
+        yield from data
+        return
+    if isinstance(data, dict):
+        inner = data.get("data")
+        if isinstance(inner, dict) and isinstance(inner.get("result"), list):
+            yield from inner["result"]
+            return
+        for key in ("traces", "data"):
+            if isinstance(data.get(key), list):
+                yield from data[key]
+                return
+    yield data
+
+
+def _get_output_mode(ctx) -> str:
+    """Get the effective output mode.
+
+    Defaults to 'pretty' on a terminal and 'raw' when piped, since a program
+    reading the output gains nothing from re-encoding the backend response.
+    Envelopes need the full parsed response, so they always use 'pretty'.
+    """
+    root_ctx = ctx.find_root()
+    if root_ctx.params.get("envelope", False):
+        return "pretty"
+    mode = root_ctx.params.get("output")
+    if mode is None:
+        mode = "pretty" if sys.stdout.isatty() else "raw"
+    return mode
+
+
+def _dumps(data, compact: bool = False) -> bytes:
+    """Encode data as newline-terminated JSON bytes, using orjson when it is available."""
+    if orjson is not None:
+        option = orjson.OPT_APPEND_NEWLINE if compact else orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+        try:
+            return orjson.dumps(data, option=option)
+        except TypeError:
+            # orjson rejects a few things stdlib accepts (e.g. ints wider than 64 bits)
+            pass
+    if compact:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode() + b"\n"
+    return json.dumps(data, indent=2, ensure_ascii=False).encode() + b"\n"
+
+
+def _loads(raw: bytes):
+    """Decode JSON bytes, using orjson when it is available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+_WRITE_BATCH_SIZE = 64 * 1024
+
+
+def _write_stdout(chunks) -> None:
+    """Write encoded chunks to stdout's binary buffer, bypassing click's text layer.
+
+    Small chunks (e.g. ndjson records) are coalesced so they cost one write
+    call per ~64 KiB rather than one per record.
+    """
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+    batch = bytearray()
+    for chunk in chunks:
+        if len(chunk) >= _WRITE_BATCH_SIZE:
+            if batch:
+                out.write(batch)
+                batch.clear()
+            out.write(chunk)
+            continue
+        batch += chunk
+        if len(batch) >= _WRITE_BATCH_SIZE:
+            out.write(batch)
+            batch.clear()
+    if batch:
+        out.write(batch)
+    out.flush()
+
+
+def output_json_stream(chunks: Iterator[bytes]) -> None:
+    """Copy an already-encoded JSON body to stdout chunk by chunk, without decoding it."""
+    last = b""
+
+    def tracked():
+        nonlocal last
+        for chunk in chunks:
+            last = chunk or last
+            yield chunk
+        if not last.endswith(b"\n"):
+            yield b"\n"
+
+    _write_stdout(tracked())
+
+
 def output_json(data, ctx=None, hints: list[str] | None = None):
-    """Output JSON data, optionally wrapped in an envelope."""
-    if ctx and _get_envelope(ctx):
+    """Output JSON data, optionally wrapped in an envelope.
+
+    data may also be an iterator of raw body chunks (from a client in raw
+    mode), which is streamed to stdout as-is.
+    """
+    with timing.span("output"):
+        _output_json(data, ctx, hints)
+
+
+def _output_json(data, ctx, hints):
+    mode = _get_output_mode(ctx) if ctx else "pretty"
+    if isinstance(data, Iterator) and mode != "ndjson":
+        # Raw mode: the body is read from the network while it is written
+        output_json_stream(data)
+    elif ctx and _get_envelope(ctx):
         count = _count_results(data)
         envelope = {
             "status": "success",
@@ -80,9 +214,16 @@ def output_json(data, ctx=None, hints: list[str] | None = None):
                 envelope["metadata"]["message"] = "No results found"
         if hints:
             envelope["hints"] = hints
-        click.echo(json.dumps(envelope, indent=2))
+        with timing.span("json encode"):
+            body = _dumps(envelope)
+        _write_stdout([body])
+    elif mode == "ndjson":
+        # data may be an iterator of records the client parses as they arrive
+        _write_stdout(_dumps(record, compact=True) for record in _iter_records(data))
     else:
-        click.echo(json.dumps(data, indent=2))
+        with timing.span("json encode"):
+            body = _dumps(data, compact=mode != "pretty")
+        _write_stdout([body])
 
 
 def output_error(msg: str, suggestions: list[str] | None = None, ctx=None):
@@ -98,18 +239,64 @@ def output_error(msg: str, suggestions: list[str] | None = None, ctx=None):
         }
         if suggestions:
             error["suggestions"] = suggestions
-        click.echo(json.dumps(error, indent=2))
+        _write_stdout([_dumps(error)])
     else:
         click.echo(f"Error: {msg}", err=True)
 
 
-@click.group()
+def _print_version(ctx, param, value):
+    """Eager --version callback: print and exit before any config or client work."""
+    if not value or ctx.resilient_parsing:
+        return
+    click.echo(f"lgtm-cli {_get_version()}")
+    ctx.exit()
+
+
+class LazyGroup(click.Group):
+    """Group whose subgroups live in their own modules and are imported on demand.
+
+    Only the invoked subgroup's module (and its click decorators) is loaded;
+    listing commands, as --help and schema do, imports all of them.
+    """
+
+    def __init__(self, *args, lazy_subcommands: dict[str, str] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # command name -> "module:attribute", relative to this package
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
+
+    def get_command(self, ctx, cmd_name: str):
+        target = self.lazy_subcommands.pop(cmd_name, None)
+        if target is not None:
+            module_name, attr = target.split(":")
+            module = importlib.import_module(module_name, __package__)
+            self.add_command(getattr(module, attr), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group(cls=LazyGroup, lazy_subcommands={
+    "loki": "._loki_cli:loki",
+    "prom": "._prom_cli:prom",
+    "tempo": "._tempo_cli:tempo",
+    "alerts": "._alerts_cli:alerts",
+})
+@click.option("--version", "-V", is_flag=True, expose_value=False, is_eager=True, callback=_print_version,
+              help="Show the version and exit")
 @click.option("--config", "-c", type=click.Path(path_type=Path), help="Config file path")
 @click.option("--instance", "-i", help="Instance name from config")
 @click.option("--envelope", is_flag=True, envvar="LGTM_ENVELOPE",
               help="Wrap output in agent-friendly envelope with metadata (or set LGTM_ENVELOPE=1)")
+@click.option("--output", type=click.Choice(["pretty", "compact", "ndjson", "raw"]), default=None, envvar="LGTM_OUTPUT",
+              help="pretty: indented JSON (default on a terminal); compact: single-line JSON; "
+                   "ndjson: one result per line; raw: stream backend responses unmodified (default when piped). "
+                   "Ignored with --envelope")
+@click.option("--profile", is_flag=True, hidden=True, envvar="LGTM_PROFILE",
+              help="Print a per-phase timing table to stderr (or set LGTM_PROFILE=1). "
+                   "Also writes cProfile data to $LGTM_PROFILE_OUT when set")
 @click.pass_context
-def main(ctx, config: Path | None, instance: str | None, envelope: bool):
+def main(ctx, config: Path | None, instance: str | None, envelope: bool, output: str | None, profile: bool):
     """LGTM CLI - Query Loki, Prometheus, and Tempo.
 
     Best practices are built-in:
@@ -120,732 +307,141 @@ def main(ctx, config: Path | None, instance: str | None, envelope: bool):
     ctx.ensure_object(dict)
     ctx.obj["config_path"] = config or DEFAULT_CONFIG_PATH
     ctx.obj["instance_name"] = instance
-    try:
-        ctx.obj["config"] = load_config(config)
-    except FileNotFoundError:
-        ctx.obj["config"] = None
-
-
-def get_instance_or_exit(ctx) -> "InstanceConfig":
-    """Get the requested instance from config, or exit with a helpful error."""
-    config = ctx.obj["config"]
-    instance_name = ctx.obj["instance_name"]
-    try:
-        return config.get_instance(instance_name)
-    except ValueError as e:
-        available = list(config.instances.keys())
-        output_error(
-            str(e),
-            suggestions=[f"Available instances: {', '.join(available)}",
-                         "Use --instance/-i to select one"] if available else None,
-            ctx=ctx,
-        )
-        sys.exit(1)
-    except StopIteration:
-        output_error(
-            "No instances configured",
-            suggestions=["Run 'lgtm discover' to auto-discover Grafana Cloud stacks",
-                         "Or manually add instances to ~/.config/lgtm/config.yaml"],
-            ctx=ctx,
-        )
-        sys.exit(1)
-
-
-# === LOKI COMMANDS ===
-
-def _config_not_found_exit(ctx):
-    """Exit with config-not-found error."""
-    output_error(
-        f"Config file not found: {ctx.obj['config_path']}",
-        suggestions=["Run 'lgtm discover' to auto-discover Grafana Cloud stacks",
-                      "Or create a config file at ~/.config/lgtm/config.yaml"],
-        ctx=ctx,
-    )
-    sys.exit(1)
-
-
-@main.group()
-@click.pass_context
-def loki(ctx):
-    """Query Loki logs."""
-    if not ctx.obj["config"]:
-        _config_not_found_exit(ctx)
-    instance = get_instance_or_exit(ctx)
-    if not instance.loki:
-        output_error(
-            f"Loki not configured for instance '{instance.name}'",
-            suggestions=["Add a 'loki' section to this instance in config",
-                          "Or run 'lgtm discover' to auto-configure"],
-            ctx=ctx,
-        )
-        sys.exit(1)
-    ctx.obj["client"] = LokiClient(instance.loki)
-
-
-@loki.command()
-@click.argument("query")
-@click.option("--start", "-s", help="Start time (RFC3339). Default: 15 minutes ago")
-@click.option("--end", "-e", help="End time (RFC3339). Default: now")
-@click.option("--limit", "-l", default=DEFAULT_LOKI_LIMIT, help=f"Max entries (default: {DEFAULT_LOKI_LIMIT})")
-@click.option("--direction", "-d", type=click.Choice(["backward", "forward"]), default="backward")
-@click.pass_context
-def query(ctx, query: str, start: str | None, end: str | None, limit: int, direction: str):
-    """Query logs with LogQL.
-
-    Examples:
-
-      lgtm loki query '{app="myapp"}'
-
-      lgtm loki query '{app="myapp"} |= "error"' --limit 100
-
-      lgtm loki query '{app="myapp"}' --start 2024-01-15T10:00:00Z --end 2024-01-15T11:00:00Z
-    """
-    default_start, default_end = get_default_times()
-    try:
-        result = ctx.obj["client"].query(
-            query=query,
-            start=start or default_start,
-            end=end or default_end,
-            limit=limit,
-            direction=direction,
-        )
-        count = _count_results(result)
-        hints = [
-            "narrow results → add label filter or line filter e.g. '|= \"error\"'",
-            "aggregate → lgtm loki instant 'count_over_time({...}[5m])'",
-        ]
-        if count is not None and count >= limit:
-            hints.insert(0, f"limit of {limit} reached → use --limit to increase or narrow your query")
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), suggestions=["Check your LogQL syntax", "Use 'lgtm loki labels' to discover available labels"], ctx=ctx)
-        sys.exit(1)
-
-
-@loki.command()
-@click.argument("query")
-@click.option("--time", "-t", help="Evaluation time (RFC3339). Default: now")
-@click.pass_context
-def instant(ctx, query: str, time: str | None):
-    """Run instant query (for metric queries like count_over_time).
-
-    Examples:
-
-      lgtm loki instant 'count_over_time({app="myapp"}[5m])'
-
-      lgtm loki instant 'sum by (level) (count_over_time({app="myapp"} | json [5m]))'
-    """
-    try:
-        result = ctx.obj["client"].query_instant(query, time)
-        hints = [
-            "range query → lgtm loki query '{...}' to see raw logs",
-            "break down → add 'by (label)' to your aggregation",
-        ]
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), suggestions=["Check your LogQL syntax"], ctx=ctx)
-        sys.exit(1)
-
-
-@loki.command()
-@click.option("--start", "-s", help="Start time filter")
-@click.option("--end", "-e", help="End time filter")
-@click.pass_context
-def labels(ctx, start: str | None, end: str | None):
-    """List available labels.
-
-    Use this first to discover what labels are available before querying.
-    """
-    try:
-        result = ctx.obj["client"].labels(start, end)
-        hints = ["get values → lgtm loki label-values <label>"]
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), ctx=ctx)
-        sys.exit(1)
-
-
-@loki.command("label-values")
-@click.argument("label")
-@click.option("--start", "-s", help="Start time filter")
-@click.option("--end", "-e", help="End time filter")
-@click.pass_context
-def label_values(ctx, label: str, start: str | None, end: str | None):
-    """List values for a label.
-
-    Examples:
-
-      lgtm loki label-values app
-
-      lgtm loki label-values namespace
-    """
-    try:
-        result = ctx.obj["client"].label_values(label, start, end)
-        hints = [
-            f"query with label → lgtm loki query '{{{label}=\"<value>\"}}'",
-            "see all labels → lgtm loki labels",
-        ]
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), suggestions=["Use 'lgtm loki labels' to see available labels"], ctx=ctx)
-        sys.exit(1)
-
-
-@loki.command()
-@click.argument("match", nargs=-1, required=True)
-@click.option("--start", "-s", help="Start time filter")
-@click.option("--end", "-e", help="End time filter")
-@click.pass_context
-def series(ctx, match: tuple[str, ...], start: str | None, end: str | None):
-    """List series matching selectors.
-
-    Examples:
-
-      lgtm loki series '{app="myapp"}'
-
-      lgtm loki series '{namespace="prod"}' '{namespace="staging"}'
-    """
-    try:
-        result = ctx.obj["client"].series(list(match), start, end)
-        hints = ["query logs → lgtm loki query '<selector>'"]
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), ctx=ctx)
-        sys.exit(1)
-
-
-# === PROMETHEUS COMMANDS ===
-
-@main.group()
-@click.pass_context
-def prom(ctx):
-    """Query Prometheus/Mimir metrics."""
-    if not ctx.obj["config"]:
-        _config_not_found_exit(ctx)
-    instance = get_instance_or_exit(ctx)
-    if not instance.prometheus:
-        output_error(
-            f"Prometheus not configured for instance '{instance.name}'",
-            suggestions=["Add a 'prometheus' section to this instance in config",
-                          "Or run 'lgtm discover' to auto-configure"],
-            ctx=ctx,
-        )
-        sys.exit(1)
-    ctx.obj["client"] = PrometheusClient(instance.prometheus)
-
-
-@prom.command()
-@click.argument("query")
-@click.option("--time", "-t", help="Evaluation time (RFC3339). Default: now")
-@click.pass_context
-def query(ctx, query: str, time: str | None):
-    """Run instant query.
-
-    Examples:
-
-      lgtm prom query 'up{job="prometheus"}'
-
-      lgtm prom query 'rate(http_requests_total[5m])'
-    """
-    try:
-        result = ctx.obj["client"].query(query, time)
-        hints = [
-            "time series → lgtm prom range '<query>' to see values over time",
-            "visualize → pipe range output to 'lgtm chart'",
-        ]
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), suggestions=["Check your PromQL syntax", "Use 'lgtm prom labels' to discover available labels"], ctx=ctx)
-        sys.exit(1)
-
-
-@prom.command()
-@click.argument("query")
-@click.option("--start", "-s", help="Start time (RFC3339). Default: 15 minutes ago")
-@click.option("--end", "-e", help="End time (RFC3339). Default: now")
-@click.option("--step", default=DEFAULT_PROM_STEP, help=f"Resolution step (default: {DEFAULT_PROM_STEP})")
-@click.pass_context
-def range(ctx, query: str, start: str | None, end: str | None, step: str):
-    """Run range query.
-
-    Examples:
-
-      lgtm prom range 'rate(http_requests_total[5m])'
-
-      lgtm prom range 'up' --step 5m --start 2024-01-15T10:00:00Z
-    """
-    default_start, default_end = get_default_times()
-    try:
-        result = ctx.obj["client"].query_range(
-            query=query,
-            start=start or default_start,
-            end=end or default_end,
-            step=step,
-        )
-        hints = [
-            "visualize → save output to file, then 'lgtm chart <file> -t \"Title\"'",
-            "finer resolution → use --step 15s or --step 30s",
-            "instant value → lgtm prom query '<query>' for current point-in-time",
-        ]
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), suggestions=["Check your PromQL syntax"], ctx=ctx)
-        sys.exit(1)
-
-
-@prom.command()
-@click.option("--start", "-s", help="Start time filter")
-@click.option("--end", "-e", help="End time filter")
-@click.pass_context
-def labels(ctx, start: str | None, end: str | None):
-    """List available labels.
-
-    Use this first to discover what labels are available.
-    """
-    try:
-        result = ctx.obj["client"].labels(start, end)
-        hints = [
-            "get values → lgtm prom label-values <label>",
-            "list metric names → lgtm prom label-values __name__",
-        ]
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), ctx=ctx)
-        sys.exit(1)
-
-
-@prom.command("label-values")
-@click.argument("label")
-@click.option("--start", "-s", help="Start time filter")
-@click.option("--end", "-e", help="End time filter")
-@click.pass_context
-def prom_label_values(ctx, label: str, start: str | None, end: str | None):
-    """List values for a label.
-
-    Examples:
-
-      lgtm prom label-values job
-
-      lgtm prom label-values __name__  # List all metric names
-    """
-    try:
-        result = ctx.obj["client"].label_values(label, start, end)
-        hints = [
-            f"query with label → lgtm prom query '<metric>{{{label}=\"<value>\"}}'",
-            "see all labels → lgtm prom labels",
-        ]
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), suggestions=["Use 'lgtm prom labels' to see available labels"], ctx=ctx)
-        sys.exit(1)
-
-
-@prom.command()
-@click.argument("match", nargs=-1, required=True)
-@click.option("--start", "-s", help="Start time filter")
-@click.option("--end", "-e", help="End time filter")
-@click.pass_context
-def series(ctx, match: tuple[str, ...], start: str | None, end: str | None):
-    """List series matching selectors.
-
-    Examples:
-
-      lgtm prom series 'up'
-
-      lgtm prom series 'http_requests_total{job="api"}'
-    """
-    try:
-        result = ctx.obj["client"].series(list(match), start, end)
-        hints = ["query metric → lgtm prom query '<metric>{<labels>}'"]
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), ctx=ctx)
-        sys.exit(1)
-
-
-@prom.command()
-@click.option("--metric", "-m", help="Filter by metric name")
-@click.pass_context
-def metadata(ctx, metric: str | None):
-    """Get metric metadata.
-
-    Examples:
-
-      lgtm prom metadata
-
-      lgtm prom metadata --metric http_requests_total
-    """
-    try:
-        result = ctx.obj["client"].metadata(metric)
-        hints = ["query metric → lgtm prom query '<metric_name>'"]
-        if not metric:
-            hints.insert(0, "filter by metric → lgtm prom metadata --metric <name>")
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), ctx=ctx)
-        sys.exit(1)
-
+    if profile:
+        timing.enabled = True
+        ctx.call_on_close(timing.report)
+        if os.environ.get("LGTM_PROFILE_OUT"):
+            _start_profiler(ctx, os.environ["LGTM_PROFILE_OUT"])
 
-# === TEMPO COMMANDS ===
 
-@main.group()
-@click.pass_context
-def tempo(ctx):
-    """Query Tempo traces."""
-    if not ctx.obj["config"]:
-        _config_not_found_exit(ctx)
-    instance = get_instance_or_exit(ctx)
-    if not instance.tempo:
-        output_error(
-            f"Tempo not configured for instance '{instance.name}'",
-            suggestions=["Add a 'tempo' section to this instance in config",
-                          "Or run 'lgtm discover' to auto-configure"],
-            ctx=ctx,
-        )
-        sys.exit(1)
-    ctx.obj["client"] = TempoClient(instance.tempo)
-
-
-@tempo.command()
-@click.argument("trace_id")
-@click.pass_context
-def trace(ctx, trace_id: str):
-    """Get trace by ID.
-
-    Use this when you have a specific trace ID to investigate.
-
-    Examples:
-
-      lgtm tempo trace abc123def456
-    """
-    try:
-        result = ctx.obj["client"].trace(trace_id)
-        hints = [
-            "search related → lgtm tempo search -q '{resource.service.name=\"<service>\"}'",
-            "find logs → lgtm loki query '{traceID=\"" + trace_id + "\"}'",
-        ]
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), ctx=ctx)
-        sys.exit(1)
-
-
-@tempo.command()
-@click.option("--query", "-q", help="TraceQL query")
-@click.option("--start", "-s", help="Start time (Unix seconds). Default: 15 minutes ago")
-@click.option("--end", "-e", help="End time (Unix seconds). Default: now")
-@click.option("--min-duration", help="Minimum duration (e.g., 100ms, 1s)")
-@click.option("--max-duration", help="Maximum duration")
-@click.option("--limit", "-l", default=DEFAULT_TEMPO_LIMIT, help=f"Max traces (default: {DEFAULT_TEMPO_LIMIT})")
-@click.pass_context
-def search(ctx, query: str | None, start: str | None, end: str | None,
-           min_duration: str | None, max_duration: str | None, limit: int):
-    """Search traces with TraceQL.
+def _start_profiler(ctx, path: str) -> None:
+    """Profile the rest of the invocation and dump pstats data to path when it finishes.
 
-    Examples:
-
-      lgtm tempo search -q '{resource.service.name="api"}'
-
-      lgtm tempo search -q '{status=error}' --min-duration 1s
-
-      lgtm tempo search --min-duration 500ms --limit 50
+    The dump can be inspected with pstats or turned into a flamegraph with
+    tools like snakeviz or flameprof.
     """
-    default_start, default_end = get_default_times_unix()
-    try:
-        result = ctx.obj["client"].search(
-            query=query,
-            start=start or default_start,
-            end=end or default_end,
-            min_duration=min_duration,
-            max_duration=max_duration,
-            limit=limit,
-        )
-        count = _count_results(result)
-        hints = [
-            "view trace → lgtm tempo trace <traceID>",
-            "filter slow → add --min-duration 1s",
-        ]
-        if count is not None and count >= limit:
-            hints.insert(0, f"limit of {limit} reached → use --limit to increase or narrow your query")
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), suggestions=["Check your TraceQL syntax", "Use 'lgtm tempo tags' to discover available tags"], ctx=ctx)
-        sys.exit(1)
+    import cProfile
 
+    profiler = cProfile.Profile()
 
-@tempo.command()
-@click.pass_context
-def tags(ctx):
-    """List available tags.
+    def dump():
+        profiler.disable()
+        profiler.dump_stats(path)
+        click.echo(f"Profile written to {path}", err=True)
 
-    Use this first to discover what tags/attributes are available.
-    """
-    try:
-        result = ctx.obj["client"].tags()
-        hints = ["get values → lgtm tempo tag-values <tag>"]
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), ctx=ctx)
-        sys.exit(1)
+    ctx.call_on_close(dump)
+    profiler.enable()
 
 
-@tempo.command("tag-values")
-@click.argument("tag")
-@click.pass_context
-def tag_values(ctx, tag: str):
-    """List values for a tag.
+def get_config(ctx):
+    """Load the config on first use, so --help and config-free commands never touch disk."""
+    if "config" not in ctx.obj:
+        try:
+            with timing.span("config load"):
+                ctx.obj["config"] = load_config(ctx.obj["config_path"])
+        except FileNotFoundError:
+            ctx.obj["config"] = None
+    return ctx.obj["config"]
 
-    Examples:
 
-      lgtm tempo tag-values service.name
+def get_instance_or_exit(ctx) -> "InstanceConfig":
+    """Get the requested instance from config, or exit with a helpful error.
 
-      lgtm tempo tag-values http.status_code
+    The resolved instance is kept in ctx.obj, so commands that touch several
+    backends look it up only once.
     """
+    if "instance" in ctx.obj:
+        return ctx.obj["instance"]
+    config = get_config(ctx)
+    instance_name = ctx.obj["instance_name"]
     try:
-        result = ctx.obj["client"].tag_values(tag)
-        hints = [
-            f"search with tag → lgtm tempo search -q '{{resource.{tag}=\"<value>\"}}'",
-            "see all tags → lgtm tempo tags",
-        ]
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), suggestions=["Use 'lgtm tempo tags' to see available tags"], ctx=ctx)
+        instance = ctx.obj["instance"] = config.get_instance(instance_name)
+        return instance
+    except ValueError as e:
+        if instance_name and instance_name not in config.instances:
+            available = list(config.instances.keys())
+            suggestions = [f"Available instances: {', '.join(available)}",
+                           "Use --instance/-i to select one"] if available else None
+        else:
+            # The instance exists but its settings are invalid (e.g. cache_level)
+            suggestions = [f"Fix the instance's settings in {ctx.obj['config_path']}"]
+        output_error(str(e), suggestions=suggestions, ctx=ctx)
         sys.exit(1)
-
-
-# === ALERTS COMMANDS ===
-
-DEFAULT_SILENCE_DURATION_HOURS = 2
-
-
-def parse_duration(duration: str) -> timedelta:
-    """Parse duration string like '2h', '30m', '1d' to timedelta."""
-    import re
-    match = re.match(r'^(\d+)([smhd])$', duration.lower())
-    if not match:
-        raise click.BadParameter(f"Invalid duration format: {duration}. Use format like '2h', '30m', '1d'")
-    value = int(match.group(1))
-    unit = match.group(2)
-    if unit == 's':
-        return timedelta(seconds=value)
-    elif unit == 'm':
-        return timedelta(minutes=value)
-    elif unit == 'h':
-        return timedelta(hours=value)
-    elif unit == 'd':
-        return timedelta(days=value)
-    raise click.BadParameter(f"Unknown time unit: {unit}")
-
-
-def parse_matcher(matcher: str) -> dict:
-    """Parse matcher string like 'alertname=HighCPU' or 'severity=~warning|critical'."""
-    import re
-    match = re.match(r'^([^=!~]+)(=~|!~|!=|=)(.*)$', matcher)
-    if not match:
-        raise click.BadParameter(f"Invalid matcher format: {matcher}. Use format like 'label=value' or 'label=~regex'")
-    name = match.group(1)
-    op = match.group(2)
-    value = match.group(3)
-    return {
-        "name": name,
-        "value": value,
-        "isRegex": op in ("=~", "!~"),
-        "isEqual": op in ("=", "=~"),
-    }
-
-
-@main.group()
-@click.pass_context
-def alerts(ctx):
-    """Query Grafana Alerting/Alertmanager."""
-    if not ctx.obj["config"]:
-        _config_not_found_exit(ctx)
-    instance = get_instance_or_exit(ctx)
-    if not instance.alerting:
+    except StopIteration:
         output_error(
-            f"Alerting not configured for instance '{instance.name}'",
-            suggestions=["Add an 'alerting' section to this instance in config",
-                          "Or run 'lgtm discover' to auto-configure"],
+            "No instances configured",
+            suggestions=["Run 'lgtm discover' to auto-discover Grafana Cloud stacks",
+                         "Or manually add instances to ~/.config/lgtm/config.yaml"],
             ctx=ctx,
         )
         sys.exit(1)
-    ctx.obj["client"] = AlertingClient(instance.alerting)
-
-
-@alerts.command("list")
-@click.option("--filter", "-f", "filters", multiple=True, help="Filter alerts by label (e.g., 'alertname=HighCPU')")
-@click.option("--receiver", "-r", help="Filter by receiver")
-@click.option("--silenced/--no-silenced", default=True, help="Include silenced alerts")
-@click.option("--inhibited/--no-inhibited", default=True, help="Include inhibited alerts")
-@click.option("--active/--no-active", default=True, help="Include active alerts")
-@click.pass_context
-def alerts_list(ctx, filters: tuple[str, ...], receiver: str | None, silenced: bool, inhibited: bool, active: bool):
-    """List firing alerts.
-
-    Examples:
 
-      lgtm alerts list
 
-      lgtm alerts list --filter 'alertname=HighCPU'
+def get_client(ctx, client_cls, service):
+    """Return a client for the given service, reusing one built earlier in this run.
 
-      lgtm alerts list --no-silenced --active
+    Clients are cached per (instance, backend type, URL) so their pooled
+    connections survive across commands that share a process.
     """
-    try:
-        result = ctx.obj["client"].list_alerts(
-            filter=list(filters) if filters else None,
-            receiver=receiver,
-            silenced=silenced,
-            inhibited=inhibited,
-            active=active,
-        )
-        hints = [
-            "silence alert → lgtm alerts silence-create --matcher 'alertname=<name>' --duration 2h --comment '<reason>' --created-by '<you>'",
-            "group view → lgtm alerts groups",
-            "filter → lgtm alerts list --filter 'severity=critical'",
-        ]
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), ctx=ctx)
-        sys.exit(1)
+    clients = ctx.obj.setdefault("clients", {})
+    key = (ctx.obj["instance_name"], client_cls.__name__, service.url)
+    client = clients.get(key)
+    if client is None:
+        client = clients[key] = client_cls(service, raw=_get_output_mode(ctx) == "raw")
+        ctx.find_root().call_on_close(client.close)
+    return client
 
 
-@alerts.command("groups")
-@click.option("--filter", "-f", "filters", multiple=True, help="Filter alerts by label")
-@click.option("--receiver", "-r", help="Filter by receiver")
-@click.pass_context
-def alerts_groups(ctx, filters: tuple[str, ...], receiver: str | None):
-    """List alerts grouped by receiver/labels.
-
-    Examples:
+def _apply_options(options):
+    """Combine click option decorators into one, keeping their listed order in --help."""
+    def decorator(f):
+        for option in reversed(options):
+            f = option(f)
+        return f
+    return decorator
 
-      lgtm alerts groups
-
-      lgtm alerts groups --filter 'severity=critical'
-    """
-    try:
-        result = ctx.obj["client"].list_alert_groups(
-            filter=list(filters) if filters else None,
-            receiver=receiver,
-        )
-        hints = [
-            "flat list → lgtm alerts list",
-            "filter → lgtm alerts groups --filter 'severity=critical'",
-        ]
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), ctx=ctx)
-        sys.exit(1)
 
+time_filter_options = _apply_options([
+    click.option("--start", "-s", help="Start time filter"),
+    click.option("--end", "-e", help="End time filter"),
+])
 
-@alerts.command("silences")
-@click.option("--filter", "-f", "filters", multiple=True, help="Filter silences by label")
-@click.pass_context
-def alerts_silences(ctx, filters: tuple[str, ...]):
-    """List all silences.
+time_range_options = _apply_options([
+    click.option("--start", "-s", help=f"Start time (RFC3339). Default: {DEFAULT_TIME_RANGE_MINUTES} minutes ago"),
+    click.option("--end", "-e", help="End time (RFC3339). Default: now"),
+])
 
-    Examples:
 
-      lgtm alerts silences
+def safe_output(suggestions: list[str] | None = None):
+    """Turn a leaf command returning (result, hints) into one that outputs JSON.
 
-      lgtm alerts silences --filter 'alertname=HighCPU'
+    Any exception is reported via output_error with the given suggestions,
+    and the command exits with status 1.
     """
-    try:
-        result = ctx.obj["client"].list_silences(
-            filter=list(filters) if filters else None,
-        )
-        hints = [
-            "view silence → lgtm alerts silence-get <id>",
-            "delete silence → lgtm alerts silence-delete <id>",
-            "create silence → lgtm alerts silence-create --matcher 'alertname=<name>' --duration 2h --comment '<reason>' --created-by '<you>'",
-        ]
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), ctx=ctx)
-        sys.exit(1)
+    def decorator(f):
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            ctx = click.get_current_context()
+            try:
+                result, hints = f(*args, **kwargs)
+                output_json(result, ctx, hints=hints)
+            except Exception as e:
+                output_error(str(e), suggestions=suggestions, ctx=ctx)
+                sys.exit(1)
+        return wrapper
+    return decorator
 
 
-@alerts.command("silence-get")
-@click.argument("silence_id")
-@click.pass_context
-def alerts_silence_get(ctx, silence_id: str):
-    """Get a specific silence by ID.
-
-    Examples:
-
-      lgtm alerts silence-get abc123-def456
-    """
-    try:
-        result = ctx.obj["client"].get_silence(silence_id)
-        hints = [
-            f"delete this silence → lgtm alerts silence-delete {silence_id}",
-            "list all silences → lgtm alerts silences",
-        ]
-        output_json(result, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), suggestions=["Use 'lgtm alerts silences' to list all silences"], ctx=ctx)
-        sys.exit(1)
-
-
-@alerts.command("silence-create")
-@click.option("--matcher", "-m", "matchers", multiple=True, required=True,
-              help="Matcher in format 'label=value' or 'label=~regex'. Can be specified multiple times.")
-@click.option("--duration", "-d", default="2h", help="Silence duration (e.g., '2h', '30m', '1d'). Default: 2h")
-@click.option("--comment", "-c", required=True, help="Comment explaining the silence")
-@click.option("--created-by", required=True, help="Creator identifier (e.g., email)")
-@click.pass_context
-def alerts_silence_create(ctx, matchers: tuple[str, ...], duration: str, comment: str, created_by: str):
-    """Create a new silence.
-
-    Examples:
-
-      lgtm alerts silence-create --matcher 'alertname=HighCPU' --duration 2h --comment "Maintenance" --created-by "user@example.com"
-
-      lgtm alerts silence-create -m 'alertname=HighCPU' -m 'severity=warning' -d 1h -c "Investigating" --created-by "ops"
-    """
-    try:
-        parsed_matchers = [parse_matcher(m) for m in matchers]
-        delta = parse_duration(duration)
-        now = datetime.now(timezone.utc)
-        starts_at = now.strftime("%Y-%m-%dT%H:%M:%SZ")
-        ends_at = (now + delta).strftime("%Y-%m-%dT%H:%M:%SZ")
-
-        result = ctx.obj["client"].create_silence(
-            matchers=parsed_matchers,
-            starts_at=starts_at,
-            ends_at=ends_at,
-            created_by=created_by,
-            comment=comment,
-        )
-        hints = [
-            "list silences → lgtm alerts silences",
-            "delete this silence → lgtm alerts silence-delete <silenceID from response>",
-        ]
-        output_json(result, ctx, hints=hints)
-    except click.BadParameter as e:
-        output_error(str(e), ctx=ctx)
-        sys.exit(1)
-    except Exception as e:
-        output_error(str(e), ctx=ctx)
-        sys.exit(1)
-
-
-@alerts.command("silence-delete")
-@click.argument("silence_id")
-@click.pass_context
-def alerts_silence_delete(ctx, silence_id: str):
-    """Delete/expire a silence by ID.
-
-    Examples:
+def _config_not_found_exit(ctx):
+    """Exit with config-not-found error."""
+    output_error(
+        f"Config file not found: {ctx.obj['config_path']}",
+        suggestions=["Run 'lgtm discover' to auto-discover Grafana Cloud stacks",
+                      "Or create a config file at ~/.config/lgtm/config.yaml"],
+        ctx=ctx,
+    )
+    sys.exit(1)
 
-      lgtm alerts silence-delete abc123-def456
-    """
-    try:
-        ctx.obj["client"].delete_silence(silence_id)
-        hints = ["list silences → lgtm alerts silences"]
-        output_json({"message": f"Silence {silence_id} deleted successfully"}, ctx, hints=hints)
-    except Exception as e:
-        output_error(str(e), suggestions=["Use 'lgtm alerts silences' to list all silences"], ctx=ctx)
-        sys.exit(1)
 
 
 # === CONFIG COMMANDS ===
@@ -854,20 +450,29 @@ def alerts_silence_delete(ctx, silence_id: str):
 @click.pass_context
 def instances(ctx):
     """List configured instances."""
-    if not ctx.obj["config"]:
+    config = get_config(ctx)
+    if not config:
         _config_not_found_exit(ctx)
-    config = ctx.obj["config"]
-    result = {
-        "default": config.default_instance,
-        "instances": {}
-    }
-    for name, instance in config.instances.items():
-        result["instances"][name] = {
+    if isinstance(config.instances, LazyInstances):
+        config.instances.prefetch_secrets()
+    urls = {}
+    for name in config.instances:
+        try:
+            instance = config.instances[name]
+        except ValueError as e:
+            output_error(
+                f"Instance '{name}': {e}",
+                suggestions=[f"Fix the instance's settings in {ctx.obj['config_path']}"],
+                ctx=ctx,
+            )
+            sys.exit(1)
+        urls[name] = {
             "loki": instance.loki.url if instance.loki else None,
             "prometheus": instance.prometheus.url if instance.prometheus else None,
             "tempo": instance.tempo.url if instance.tempo else None,
             "alerting": instance.alerting.url if instance.alerting else None,
         }
+    result = {"default": config.default_instance, "instances": urls}
     hints = [
         "query logs → lgtm -i <instance> loki query '{app=\"<app>\"}'",
         "query metrics → lgtm -i <instance> prom query 'up'",
@@ -954,9 +559,11 @@ def schema(ctx, compact: bool):
         "version": _get_version(),
         "description": "CLI for querying Loki, Prometheus/Mimir, Tempo, and Grafana Alerting",
         "global_flags": [
+            {"flags": ["--version", "-V"], "description": "Show the version and exit"},
             {"flags": ["--config", "-c"], "description": "Config file path"},
             {"flags": ["--instance", "-i"], "description": "Instance name from config"},
             {"flags": ["--envelope"], "description": "Wrap output in agent-friendly envelope with metadata"},
+            {"flags": ["--output"], "description": "Output format: pretty, compact, ndjson, or raw (unmodified backend response)"},
         ],
         "commands": [],
         "query_syntax": {
@@ -970,7 +577,7 @@ def schema(ctx, compact: bool):
             "tempo": "Unix seconds (e.g., 1705312800)",
         },
         "defaults": {
-            "time_range": "15 minutes",
+            "time_range": f"{DEFAULT_TIME_RANGE_MINUTES} minutes",
             "loki_limit": DEFAULT_LOKI_LIMIT,
             "tempo_limit": DEFAULT_TEMPO_LIMIT,
             "prom_step": DEFAULT_PROM_STEP,
@@ -990,7 +597,7 @@ def schema(ctx, compact: bool):
         del result["time_formats"]
         del result["defaults"]
 
-    click.echo(json.dumps(result, indent=2))
+    _write_stdout([_dumps(result)])
 
 
 def _compact_schema(schema: dict) -> dict:
@@ -1031,6 +638,8 @@ def discover(ctx, token: str, org: str | None, token_env_var: str, overwrite: bo
 
       GRAFANA_CLOUD_API_TOKEN=glc_xxx lgtm discover --dry-run
     """
+    from .client import GrafanaCloudClient
+
     cloud_client = GrafanaCloudClient(token)
 
     try:
@@ -1058,8 +667,7 @@ def discover(ctx, token: str, org: str | None, token_env_var: str, overwrite: bo
 
     config_path = ctx.obj["config_path"]
     if config_path.exists():
-        with open(config_path) as f:
-            existing = yaml.safe_load(f) or {}
+        existing = read_yaml(config_path) or {}
     else:
         existing = {"version": "1", "instances": {}}
 
@@ -1126,8 +734,8 @@ def chart(file: str, chart_type: str, title: str | None, width: int | None, heig
     """
     from .chart import render_chart
 
-    with open(file) as f:
-        data = json.load(f)
+    with open(file, "rb") as f:
+        data = _loads(f.read())
 
     # Handle both raw Prometheus response and envelope format
     if "data" in data and "result" not in data.get("data", {}):
@@ -1143,5 +751,35 @@ def chart(file: str, chart_type: str, title: str | None, width: int | None, heig
         render_chart(data, chart_type=chart_type, title=title, width=width, height=height)
 
 
+_LAZY_CLIENTS = {"LokiClient", "PrometheusClient", "TempoClient", "AlertingClient", "GrafanaCloudClient"}
+
+# Names that moved to the lazily loaded command modules -> their new home.
+# Where two groups had a command of the same name, the one this module used to
+# export (the last defined) is kept.
+_MOVED_NAMES = {
+    **dict.fromkeys(("loki", "instant", "label_values"), "._loki_cli"),
+    **dict.fromkeys(
+        ("prom", "query", "range", "labels", "prom_label_values", "series", "metadata"), "._prom_cli"
+    ),
+    **dict.fromkeys(("tempo", "trace", "search", "tags", "tag_values"), "._tempo_cli"),
+    **dict.fromkeys((
+        "alerts", "alerts_list", "alerts_groups", "alerts_silences", "alerts_silence_get",
+        "alerts_silence_create", "alerts_silence_delete", "parse_duration", "parse_matcher",
+    ), "._alerts_cli"),
+}
+
+
+def __getattr__(name: str):
+    # Client classes used to be imported here eagerly; keep them importable
+    # from this module without paying for httpx on every CLI start
+    if name in _LAZY_CLIENTS:
+        from . import client
+        return getattr(client, name)
+    # Likewise for the command groups and their helpers
+    if name in _MOVED_NAMES:
+        return getattr(importlib.import_module(_MOVED_NAMES[name], __package__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == "__main__":
     main()
@@ -1,16 +1,339 @@
+from __future__ import annotations
+
 import base64
-from urllib.parse import urlencode
+import importlib.util
+import random
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from . import timing
+from .config import ServiceConfig
 
-import httpx
+if TYPE_CHECKING:
+    import httpx
+
+try:
+    import orjson
+except ImportError:  # optional speedup, installed via the "fast" extra
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional incremental parser, installed via the "stream" extra
+    ijson = None
+
+
+_HTTPX = None
+
+
+def _httpx():
+    """Import httpx on first use.
+
+    Its import chain (ssl, certifi, httpcore, anyio, ...) dominates start-up,
+    so commands that never reach the network should not pay for it.
+    """
+    global _HTTPX
+    if _HTTPX is None:
+        import httpx
+        _HTTPX = httpx
+    return _HTTPX
+
+
+def _parse_json(response: httpx.Response):
+    """Decode a JSON response body, using orjson on the raw bytes when available."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _params(**kw) -> list[tuple[str, object]]:
+    """Build query params from keyword arguments, leaving out those that are unset or empty."""
+    return [(k, v) for k, v in kw.items() if v]
+
+
+def _walk_prefix(data, prefix: str) -> Iterator:
+    """Yield the items an ijson prefix like "data.result.item" selects from decoded data."""
+    for key in prefix.split(".")[:-1]:
+        data = data.get(key) if isinstance(data, dict) else None
+    yield from data or ()
+
+
+def _retry_delay(attempt: int, backoff: float, response: httpx.Response | None) -> float:
+    """Seconds to wait before retry number attempt + 1: Retry-After if given, else jittered exponential."""
+    retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+    if retry_after.isdigit():
+        return min(float(retry_after), RETRY_MAX_DELAY)
+    return min(backoff * 2 ** attempt + random.uniform(0, backoff), RETRY_MAX_DELAY)
+
+
+def _iter_body(response: httpx.Response) -> Iterator[bytes]:
+    """Yield a streamed response body in chunks, closing the response afterwards."""
+    try:
+        yield from response.iter_bytes(STREAM_CHUNK_SIZE)
+    finally:
+        response.close()
+
+
+# Connection pool sizing shared by all backend clients
+POOL_MAX_CONNECTIONS = 16
+POOL_MAX_KEEPALIVE_CONNECTIONS = 10
+# Seconds an idle keep-alive connection is kept for reuse
+POOL_KEEPALIVE_EXPIRY = 30.0
+# Read size used when streaming raw response bodies
+STREAM_CHUNK_SIZE = 64 * 1024
+# cache_level -> (seconds start/end are snapped to, seconds a cached response is reused)
+CACHE_POLICIES = {
+    "low": (60, 60),
+    "med": (600, 300),
+    "high": (3600, 900),
+}
+CACHE_MAX_ENTRIES = 512
+# Responses worth retrying for idempotent requests, and the longest wait between attempts
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+RETRY_MAX_DELAY = 5.0
+# Request headers for bodies encoded by hand
+JSON_CONTENT_TYPE = {"Content-Type": "application/json"}
+# Default number of requests kept in flight by the concurrent helpers
+DEFAULT_CONCURRENCY = 8
+# Negotiate HTTP/2 (multiplexed requests over one connection) when h2 is installed
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+
+def _snap_time(value: str, step: int, up: bool) -> str:
+    """Round a unix-seconds or RFC3339 timestamp down (or up) to a multiple of step seconds.
+
+    Anything else (relative times, nanosecond epochs) is returned unchanged.
+    """
+    try:
+        seconds, as_rfc3339 = int(value), False
+    except ValueError:
+        try:
+            dt = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+        if dt.tzinfo is None:
+            return value
+        seconds, as_rfc3339 = int(dt.timestamp()), True
+    if seconds > 10**11:
+        return value
+    snapped = -(-seconds // step) * step if up else seconds // step * step
+    if as_rfc3339:
+        return datetime.fromtimestamp(snapped, timezone.utc).isoformat().replace("+00:00", "Z")
+    return str(snapped)
+
+
+def _snap_range(params: list[tuple[str, object]], step: int) -> list[tuple[str, object]]:
+    """Widen start/end params to step boundaries, so nearby ranges share a cache entry."""
+    return [
+        (k, _snap_time(str(v), step, up=k == "end") if k in ("start", "end") else v)
+        for k, v in params
+    ]
+
+
+class _TTLCache:
+    """Small LRU cache whose entries expire a fixed number of seconds after being stored."""
+
+    __slots__ = ("ttl", "maxsize", "_entries")
+
+    def __init__(self, ttl: float, maxsize: int = CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+
+    def get(self, key: tuple):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: tuple, value) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+async def _gather_limited(coros, limit: int) -> list:
+    """Await coroutines concurrently, with at most `limit` in flight at once."""
+    import asyncio
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(run(coro) for coro in coros))
+
+
+def _merge_series(results: list[dict]) -> dict:
+    """Combine several series responses into one, dropping duplicate label sets."""
+    merged = {}
+    for result in results:
+        for labels in result.get("data") or []:
+            merged.setdefault(tuple(sorted(labels.items())), labels)
+    return {"status": "success", "data": list(merged.values())}
+
+
+def series_concurrently(
+    client: LokiClient | PrometheusClient,
+    match: list[str],
+    start: str | None = None,
+    end: str | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> dict:
+    """Fetch series with one request per matcher, up to `concurrency` at a time.
+
+    Only worth it on backends that evaluate the matchers of a single request
+    one after another; the merged result matches a batched series() call.
+    """
+    import asyncio
+
+    async def fetch():
+        try:
+            return await _gather_limited([client.aseries([m], start, end) for m in match], concurrency)
+        finally:
+            # The async client is bound to this event loop, which asyncio.run() closes
+            await client.aclose()
+
+    return _merge_series(asyncio.run(fetch()))
+
+
+async def gather_label_values(
+    client: LokiClient | PrometheusClient,
+    labels: list[str],
+    start: str | None = None,
+    end: str | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> dict[str, list]:
+    """Fetch the values of several labels concurrently, keyed by label name."""
+    results = await _gather_limited([client.alabel_values(label, start, end) for label in labels], concurrency)
+    return {label: result.get("data", []) for label, result in zip(labels, results)}
 
-from .config import ServiceConfig
+
+class RequestCoalescer:
+    """Share in-flight async requests between callers asking for the same thing.
+
+    Concurrent calls with identical arguments await a single HTTP request,
+    and at most `concurrency` distinct requests run at once. Results are not
+    kept once a request completes.
+    """
+
+    __slots__ = ("client", "_inflight", "_semaphore")
+
+    def __init__(self, client: LokiClient | PrometheusClient, concurrency: int = DEFAULT_CONCURRENCY):
+        import asyncio
+
+        self.client = client
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def labels(self, start: str | None = None, end: str | None = None) -> dict:
+        return await self._coalesce(("labels", start, end), self.client.alabels, start, end)
+
+    async def label_values(self, label: str, start: str | None = None, end: str | None = None) -> dict:
+        return await self._coalesce(("label_values", label, start, end), self.client.alabel_values, label, start, end)
+
+    async def series(self, match: list[str], start: str | None = None, end: str | None = None) -> dict:
+        return await self._coalesce(("series", tuple(match), start, end), self.client.aseries, match, start, end)
+
+    async def _coalesce(self, key: tuple, fetch, *args):
+        import asyncio
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = asyncio.ensure_future(self._limited(fetch, *args))
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller being cancelled does not cancel the others' request
+        return await asyncio.shield(future)
+
+    async def _limited(self, fetch, *args):
+        async with self._semaphore:
+            return await fetch(*args)
 
 
 class LGTMClient:
-    def __init__(self, config: ServiceConfig, timeout: float = 30.0):
+    __slots__ = ("config", "base_url", "timeout", "raw", "_client", "_async_client", "_headers", "_cache", "_snap")
+
+    def __init__(self, config: ServiceConfig, timeout: float = 30.0, raw: bool = False):
         self.config = config
         self.base_url = config.url.rstrip("/")
         self.timeout = timeout
+        # When set, GET requests return an iterator over the undecoded body
+        self.raw = raw
+        self._client: httpx.Client | None = None
+        self._async_client: httpx.AsyncClient | None = None
+        # Auth and custom headers are fixed per instance, so build them once
+        self._headers = self._get_headers()
+        policy = CACHE_POLICIES.get(config.cache_level)
+        self._snap = policy[0] if policy else None
+        self._cache = _TTLCache(policy[1]) if policy else None
+
+    def _http(self) -> httpx.Client:
+        """Return the pooled HTTP client, creating it on first use.
+
+        Keeping one client per instance lets consecutive requests reuse
+        keep-alive connections instead of paying a TCP/TLS handshake each time.
+        """
+        if self._client is None:
+            self._client = _httpx().Client(**self._client_options())
+        return self._client
+
+    def _ahttp(self) -> httpx.AsyncClient:
+        """Return the pooled async HTTP client, creating it on first use."""
+        if self._async_client is None:
+            self._async_client = _httpx().AsyncClient(**self._client_options())
+        return self._async_client
+
+    def _client_options(self) -> dict:
+        httpx = _httpx()
+        limits = httpx.Limits(
+            max_connections=POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=POOL_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=POOL_KEEPALIVE_EXPIRY,
+        )
+        return {
+            "base_url": self.base_url,
+            "headers": self._headers,
+            "timeout": self.timeout,
+            "limits": limits,
+            "http2": HTTP2_ENABLED,
+        }
+
+    def close(self) -> None:
+        """Close pooled connections. The client reconnects if used again.
+
+        The async client must be closed from its event loop with aclose().
+        """
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        """Close the async client's pooled connections."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
 
     def _get_headers(self) -> dict[str, str]:
         headers = {"Accept": "application/json"}
@@ -24,40 +347,169 @@ class LGTMClient:
             headers.update(self.config.headers)
         return headers
 
-    def get(self, path: str, params: dict | None = None) -> dict:
-        url = f"{self.base_url}{path}"
-        with httpx.Client(timeout=self.timeout) as client:
-            response = client.get(url, params=params, headers=self._get_headers())
+    def _send(self, method: str, path: str, params: dict | list[tuple[str, object]] | None = None) -> httpx.Response:
+        """Send an idempotent request and return the response with its body unread.
+
+        Transport failures (connect/read errors, timeouts, dropped keep-alive
+        connections) and 429/502/503/504 responses are retried up to
+        config.retries times with exponential backoff, honouring Retry-After.
+        """
+        httpx = _httpx()
+        client = self._http()
+        request = client.build_request(method, path, params=params)
+        for attempt in range(self.config.retries + 1):
+            last_attempt = attempt == self.config.retries
+            try:
+                with timing.span("http send"):
+                    response = client.send(request, stream=True)
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+                response = None
+            else:
+                if last_attempt or response.status_code not in RETRY_STATUSES:
+                    return response
+                response.close()
+            time.sleep(_retry_delay(attempt, self.config.retry_backoff, response))
+
+    async def _asend(self, method: str, path: str, params: dict | list[tuple[str, object]] | None = None) -> httpx.Response:
+        """Async variant of _send(); the body is read before returning."""
+        import asyncio
+
+        httpx = _httpx()
+        client = self._ahttp()
+        for attempt in range(self.config.retries + 1):
+            last_attempt = attempt == self.config.retries
+            try:
+                response = await client.request(method, path, params=params)
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+                response = None
+            else:
+                if last_attempt or response.status_code not in RETRY_STATUSES:
+                    return response
+            await asyncio.sleep(_retry_delay(attempt, self.config.retry_backoff, response))
+
+    def get(self, path: str, params: dict | list[tuple[str, object]] | None = None) -> dict:
+        if self.raw:
+            return self.get_stream(path, params)
+        # Send and read separately so --profile can tell latency from transfer time
+        response = self._send("GET", path, params)
+        with timing.span("http read"):
+            response.read()
+        response.raise_for_status()
+        with timing.span("json parse"):
+            return _parse_json(response)
+
+    def iter_items(self, path: str, params: dict | list[tuple[str, object]] | None, prefix: str) -> Iterator:
+        """Yield the elements of one array in a JSON response, e.g. prefix "data.result.item".
+
+        With ijson installed the body is parsed as it arrives, so large results
+        are never held in memory at once; otherwise the response is decoded
+        whole and then walked.
+        """
+        response = self._send("GET", path, params)
+        if ijson is None:
+            response.read()
+            response.raise_for_status()
+            with timing.span("json parse"):
+                data = _parse_json(response)
+            yield from _walk_prefix(data, prefix)
+            return
+        try:
+            response.raise_for_status()
+            items = ijson.sendable_list()
+            parser = ijson.items_coro(items, prefix, use_float=True)
+            for chunk in response.iter_bytes(STREAM_CHUNK_SIZE):
+                parser.send(chunk)
+                yield from items
+                del items[:]
+            parser.close()
+            yield from items
+        finally:
+            response.close()
+
+    def get_cached(self, path: str, params: list[tuple[str, object]] | None = None) -> dict:
+        """GET a metadata endpoint, reusing a recent response for the same (snapped) range.
+
+        Behaves like get() when the service's cache_level is "none" or in raw mode.
+        """
+        if self._cache is None or self.raw:
+            return self.get(path, params)
+        params = _snap_range(params or [], self._snap)
+        key = (path, tuple(params))
+        result = self._cache.get(key)
+        if result is None:
+            result = self.get(path, params)
+            self._cache.set(key, result)
+        return result
+
+    def get_stream(self, path: str, params: dict | list[tuple[str, object]] | None = None) -> Iterator[bytes]:
+        """Send a GET request and return its body as an iterator of raw byte chunks.
+
+        The status is checked before returning, so HTTP errors are raised here
+        rather than part-way through consuming the body.
+        """
+        response = self._send("GET", path, params)
+        try:
             response.raise_for_status()
-            return response.json()
+        except _httpx().HTTPStatusError:
+            response.close()
+            raise
+        return _iter_body(response)
+
+    async def aget(self, path: str, params: dict | list[tuple[str, object]] | None = None) -> dict:
+        """Async variant of get(), so callers can run many requests with asyncio.gather()."""
+        response = await self._asend("GET", path, params)
+        response.raise_for_status()
+        return _parse_json(response)
+
+    async def aget_cached(self, path: str, params: list[tuple[str, object]] | None = None) -> dict:
+        """Async variant of get_cached()."""
+        if self._cache is None:
+            return await self.aget(path, params)
+        params = _snap_range(params or [], self._snap)
+        key = (path, tuple(params))
+        result = self._cache.get(key)
+        if result is None:
+            result = await self.aget(path, params)
+            self._cache.set(key, result)
+        return result
 
     def post(self, path: str, data: dict | None = None, params: dict | None = None) -> dict:
-        url = f"{self.base_url}{path}"
-        with httpx.Client(timeout=self.timeout) as client:
-            response = client.post(url, data=data, params=params, headers=self._get_headers())
-            response.raise_for_status()
-            return response.json()
+        response = self._http().post(path, data=data, params=params)
+        response.raise_for_status()
+        return _parse_json(response)
 
     def post_json(self, path: str, json_data: dict | None = None, params: dict | None = None) -> dict:
-        url = f"{self.base_url}{path}"
-        with httpx.Client(timeout=self.timeout) as client:
-            response = client.post(url, json=json_data, params=params, headers=self._get_headers())
-            response.raise_for_status()
-            return response.json()
+        if orjson is not None:
+            content = orjson.dumps(json_data)
+            response = self._http().post(path, content=content, headers=JSON_CONTENT_TYPE, params=params)
+        else:
+            response = self._http().post(path, json=json_data, params=params)
+        response.raise_for_status()
+        return _parse_json(response)
 
     def delete(self, path: str, params: dict | None = None) -> dict:
-        url = f"{self.base_url}{path}"
-        with httpx.Client(timeout=self.timeout) as client:
-            response = client.delete(url, params=params, headers=self._get_headers())
-            response.raise_for_status()
-            if response.text:
-                return response.json()
-            return {}
+        response = self._send("DELETE", path, params)
+        response.read()
+        response.raise_for_status()
+        if response.content:
+            return _parse_json(response)
+        return {}
 
 
 class LokiClient(LGTMClient):
+    __slots__ = ()
+
+    PATH_QUERY_RANGE = "/loki/api/v1/query_range"
+    PATH_QUERY = "/loki/api/v1/query"
+    PATH_LABELS = "/loki/api/v1/labels"
+    PATH_SERIES = "/loki/api/v1/series"
+
     def query(self, query: str, start: str, end: str, limit: int = 100, direction: str = "backward") -> dict:
-        return self.get("/loki/api/v1/query_range", {
+        return self.get(self.PATH_QUERY_RANGE, {
             "query": query,
             "start": start,
             "end": end,
@@ -65,84 +517,187 @@ class LokiClient(LGTMClient):
             "direction": direction,
         })
 
+    def iter_query_range(
+        self,
+        query: str,
+        start: str,
+        end: str,
+        chunk: int = 1000,
+        direction: str = "backward",
+        limit: int | None = None,
+    ) -> Iterator[dict]:
+        """Yield log streams for a range query, fetching at most `chunk` entries per request.
+
+        Like logcli, each page moves the time range past the oldest (or, going
+        forward, newest) entry seen, skipping entries at that boundary which
+        were already yielded, so memory stays flat however many lines are
+        requested. Stops after `limit` entries, or when a page comes back short.
+        Metric queries are not paged and yield their series from one request.
+        """
+        backward = direction == "backward"
+        remaining = limit
+        seen_at_edge: set[tuple] = set()
+        while remaining is None or remaining > 0:
+            # Boundary entries come back again, so ask for that many extra; this
+            # way a full page always holds something new, even when more than
+            # `chunk` entries share one timestamp
+            page_limit = (chunk if remaining is None else min(chunk, remaining)) + len(seen_at_edge)
+            params = {"query": query, "start": start, "end": end, "limit": page_limit, "direction": direction}
+            returned = yielded = 0
+            edge = None
+            edge_entries: set[tuple] = set()
+            for stream in self.iter_items(self.PATH_QUERY_RANGE, params, "data.result.item"):
+                if "stream" not in stream:
+                    yield stream
+                    continue
+                labels = stream["stream"]
+                key = tuple(sorted(labels.items()))
+                values = []
+                for value in stream.get("values", ()):
+                    entry = (key, value[0], value[1])
+                    returned += 1
+                    ts = int(value[0])
+                    if edge is None or (ts < edge if backward else ts > edge):
+                        edge, edge_entries = ts, {entry}
+                    elif ts == edge:
+                        edge_entries.add(entry)
+                    if entry not in seen_at_edge:
+                        values.append(value)
+                if remaining is not None:
+                    values = values[:remaining - yielded]
+                if values:
+                    yielded += len(values)
+                    yield {**stream, "values": values}
+            if remaining is not None:
+                remaining -= yielded
+            # A short page is the last one; a page of only repeats means we are stuck on one timestamp
+            if edge is None or returned < page_limit or not yielded:
+                return
+            seen_at_edge = edge_entries
+            if backward:
+                end = str(edge + 1)  # end is exclusive
+            else:
+                start = str(edge)
+
     def query_instant(self, query: str, time: str | None = None) -> dict:
-        params = {"query": query}
-        if time:
-            params["time"] = time
-        return self.get("/loki/api/v1/query", params)
+        return self.get(self.PATH_QUERY, [("query", query)] + _params(time=time))
 
     def labels(self, start: str | None = None, end: str | None = None) -> dict:
-        params = {}
-        if start:
-            params["start"] = start
-        if end:
-            params["end"] = end
-        return self.get("/loki/api/v1/labels", params or None)
+        return self.get_cached(self.PATH_LABELS, _params(start=start, end=end))
 
     def label_values(self, label: str, start: str | None = None, end: str | None = None) -> dict:
-        params = {}
-        if start:
-            params["start"] = start
-        if end:
-            params["end"] = end
-        return self.get(f"/loki/api/v1/label/{label}/values", params or None)
+        return self.get_cached(f"/loki/api/v1/label/{label}/values", _params(start=start, end=end))
 
     def series(self, match: list[str], start: str | None = None, end: str | None = None) -> dict:
-        params = {"match[]": match}
-        if start:
-            params["start"] = start
-        if end:
-            params["end"] = end
-        return self.get("/loki/api/v1/series", params)
+        params = [("match[]", m) for m in match] + _params(start=start, end=end)
+        return self.get(self.PATH_SERIES, params)
+
+    async def aquery(self, query: str, start: str, end: str, limit: int = 100, direction: str = "backward") -> dict:
+        return await self.aget(self.PATH_QUERY_RANGE, {
+            "query": query,
+            "start": start,
+            "end": end,
+            "limit": limit,
+            "direction": direction,
+        })
+
+    async def alabels(self, start: str | None = None, end: str | None = None) -> dict:
+        return await self.aget_cached(self.PATH_LABELS, _params(start=start, end=end))
+
+    async def alabel_values(self, label: str, start: str | None = None, end: str | None = None) -> dict:
+        return await self.aget_cached(f"/loki/api/v1/label/{label}/values", _params(start=start, end=end))
+
+    async def aseries(self, match: list[str], start: str | None = None, end: str | None = None) -> dict:
+        params = [("match[]", m) for m in match] + _params(start=start, end=end)
+        return await self.aget(self.PATH_SERIES, params)
 
 
 class PrometheusClient(LGTMClient):
+    __slots__ = ()
+
+    PATH_QUERY = "/api/v1/query"
+    PATH_QUERY_RANGE = "/api/v1/query_range"
+    PATH_LABELS = "/api/v1/labels"
+    PATH_SERIES = "/api/v1/series"
+    PATH_METADATA = "/api/v1/metadata"
+
     def query(self, query: str, time: str | None = None) -> dict:
-        params = {"query": query}
-        if time:
-            params["time"] = time
-        return self.get("/api/v1/query", params)
+        return self.get(self.PATH_QUERY, [("query", query)] + _params(time=time))
 
     def query_range(self, query: str, start: str, end: str, step: str = "60s") -> dict:
-        return self.get("/api/v1/query_range", {
+        return self.get(self.PATH_QUERY_RANGE, {
             "query": query,
             "start": start,
             "end": end,
             "step": step,
         })
 
+    def iter_query_range(self, query: str, start: str, end: str, step: str = "60s") -> Iterator[dict]:
+        """Like query_range(), but yield the result series one by one as they are parsed."""
+        return self.iter_items(self.PATH_QUERY_RANGE, {
+            "query": query,
+            "start": start,
+            "end": end,
+            "step": step,
+        }, "data.result.item")
+
     def labels(self, start: str | None = None, end: str | None = None) -> dict:
-        params = {}
-        if start:
-            params["start"] = start
-        if end:
-            params["end"] = end
-        return self.get("/api/v1/labels", params or None)
+        return self.get_cached(self.PATH_LABELS, _params(start=start, end=end))
 
-    def label_values(self, label: str, start: str | None = None, end: str | None = None) -> dict:
-        params = {}
-        if start:
-            params["start"] = start
-        if end:
-            params["end"] = end
-        return self.get(f"/api/v1/label/{label}/values", params or None)
+    def label_values(
+        self,
+        label: str,
+        start: str | None = None,
+        end: str | None = None,
+        match: list[str] | None = None,
+        limit: int | None = None,
+    ) -> dict:
+        params = [("match[]", m) for m in match or ()] + _params(start=start, end=end, limit=limit)
+        return self.get_cached(f"/api/v1/label/{label}/values", params)
 
     def series(self, match: list[str], start: str | None = None, end: str | None = None) -> dict:
-        params = {"match[]": match}
-        if start:
-            params["start"] = start
-        if end:
-            params["end"] = end
-        return self.get("/api/v1/series", params)
+        params = [("match[]", m) for m in match] + _params(start=start, end=end)
+        return self.get(self.PATH_SERIES, params)
 
     def metadata(self, metric: str | None = None) -> dict:
-        params = {}
-        if metric:
-            params["metric"] = metric
-        return self.get("/api/v1/metadata", params or None)
+        return self.get_cached(self.PATH_METADATA, _params(metric=metric))
+
+    async def aquery(self, query: str, time: str | None = None) -> dict:
+        return await self.aget(self.PATH_QUERY, [("query", query)] + _params(time=time))
+
+    async def aquery_range(self, query: str, start: str, end: str, step: str = "60s") -> dict:
+        return await self.aget(self.PATH_QUERY_RANGE, {
+            "query": query,
+            "start": start,
+            "end": end,
+            "step": step,
+        })
+
+    async def alabels(self, start: str | None = None, end: str | None = None) -> dict:
+        return await self.aget_cached(self.PATH_LABELS, _params(start=start, end=end))
+
+    async def alabel_values(
+        self,
+        label: str,
+        start: str | None = None,
+        end: str | None = None,
+        match: list[str] | None = None,
+        limit: int | None = None,
+    ) -> dict:
+        params = [("match[]", m) for m in match or ()] + _params(start=start, end=end, limit=limit)
+        return await self.aget_cached(f"/api/v1/label/{label}/values", params)
+
+    async def aseries(self, match: list[str], start: str | None = None, end: str | None = None) -> dict:
+        params = [("match[]", m) for m in match] + _params(start=start, end=end)
+        return await self.aget(self.PATH_SERIES, params)
 
 
 class TempoClient(LGTMClient):
+    __slots__ = ()
+
+    PATH_SEARCH = "/api/search"
+    PATH_TAGS = "/api/search/tags"
+
     def trace(self, trace_id: str) -> dict:
         return self.get(f"/api/traces/{trace_id}")
 
@@ -155,29 +710,44 @@ class TempoClient(LGTMClient):
         max_duration: str | None = None,
         limit: int = 20,
     ) -> dict:
-        params = {"limit": limit}
-        if query:
-            params["q"] = query
-        if start:
-            params["start"] = start
-        if end:
-            params["end"] = end
-        if min_duration:
-            params["minDuration"] = min_duration
-        if max_duration:
-            params["maxDuration"] = max_duration
-        return self.get("/api/search", params)
+        params = self._search_params(query, start, end, min_duration, max_duration, limit)
+        return self.get(self.PATH_SEARCH, params)
+
+    def iter_search(
+        self,
+        query: str | None = None,
+        start: str | None = None,
+        end: str | None = None,
+        min_duration: str | None = None,
+        max_duration: str | None = None,
+        limit: int = 20,
+    ) -> Iterator[dict]:
+        """Like search(), but yield the matching traces one by one as they are parsed."""
+        params = self._search_params(query, start, end, min_duration, max_duration, limit)
+        return self.iter_items(self.PATH_SEARCH, params, "traces.item")
+
+    @staticmethod
+    def _search_params(query, start, end, min_duration, max_duration, limit) -> list[tuple[str, object]]:
+        return [("limit", limit)] + _params(
+            q=query,
+            start=start,
+            end=end,
+            minDuration=min_duration,
+            maxDuration=max_duration,
+        )
 
     def tags(self) -> dict:
-        return self.get("/api/search/tags")
+        return self.get_cached(self.PATH_TAGS)
 
     def tag_values(self, tag: str) -> dict:
-        return self.get(f"/api/search/tag/{tag}/values")
+        return self.get_cached(f"/api/search/tag/{tag}/values")
 
 
 class GrafanaCloudClient:
     """Client for the Grafana Cloud management API."""
 
+    __slots__ = ("token", "base_url", "timeout")
+
     def __init__(self, token: str, timeout: float = 30.0):
         self.token = token
         self.base_url = "https://grafana.com/api"
@@ -197,11 +767,11 @@ class GrafanaCloudClient:
         all_items = []
         params: dict[str, str] = {}
         max_pages = 100
-        with httpx.Client(timeout=self.timeout) as client:
+        with _httpx().Client(headers=self._get_headers(), timeout=self.timeout) as client:
             for _ in range(max_pages):
-                response = client.get(url, params=params, headers=self._get_headers())
+                response = client.get(url, params=params)
                 response.raise_for_status()
-                data = response.json()
+                data = _parse_json(response)
                 all_items.extend(data.get("items", []))
                 next_cursor = data.get("nextCursor", "")
                 if not next_cursor:
@@ -211,7 +781,12 @@ class GrafanaCloudClient:
 
 
 class AlertingClient(LGTMClient):
+    __slots__ = ()
+
     BASE_PATH = "/api/alertmanager/grafana/api/v2"
+    PATH_ALERTS = f"{BASE_PATH}/alerts"
+    PATH_ALERT_GROUPS = f"{BASE_PATH}/alerts/groups"
+    PATH_SILENCES = f"{BASE_PATH}/silences"
 
     def list_alerts(
         self,
@@ -225,30 +800,20 @@ class AlertingClient(LGTMClient):
             "silenced": str(silenced).lower(),
             "inhibited": str(inhibited).lower(),
             "active": str(active).lower(),
+            **{k: v for k, v in (("filter", filter), ("receiver", receiver)) if v},
         }
-        if filter:
-            params["filter"] = filter
-        if receiver:
-            params["receiver"] = receiver
-        return self.get(f"{self.BASE_PATH}/alerts", params)
+        return self.get(self.PATH_ALERTS, params)
 
     def list_alert_groups(
         self,
         filter: list[str] | None = None,
         receiver: str | None = None,
     ) -> list:
-        params = {}
-        if filter:
-            params["filter"] = filter
-        if receiver:
-            params["receiver"] = receiver
-        return self.get(f"{self.BASE_PATH}/alerts/groups", params or None)
+        params = {k: v for k, v in (("filter", filter), ("receiver", receiver)) if v}
+        return self.get(self.PATH_ALERT_GROUPS, params or None)
 
     def list_silences(self, filter: list[str] | None = None) -> list:
-        params = {}
-        if filter:
-            params["filter"] = filter
-        return self.get(f"{self.BASE_PATH}/silences", params or None)
+        return self.get(self.PATH_SILENCES, {"filter": filter} if filter else None)
 
     def get_silence(self, silence_id: str) -> dict:
         return self.get(f"{self.BASE_PATH}/silence/{silence_id}")
@@ -268,7 +833,7 @@ class AlertingClient(LGTMClient):
             "createdBy": created_by,
             "comment": comment,
         }
-        return self.post_json(f"{self.BASE_PATH}/silences", payload)
+        return self.post_json(self.PATH_SILENCES, payload)
 
     def delete_silence(self, silence_id: str) -> dict:
         return self.delete(f"{self.BASE_PATH}/silence/{silence_id}")
@@ -1,24 +1,48 @@
+import functools
 import os
 import re
 import subprocess
+from collections.abc import Iterator, Mapping
 from pathlib import Path
 from dataclasses import dataclass
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
 
 DEFAULT_CONFIG_PATH = Path.home() / ".config" / "lgtm" / "config.yaml"
 
+# ${op://vault/item/field} and ${VAR_NAME} placeholders inside config strings
+_OP_RE = re.compile(r'\$\{(op://[^}]+)\}')
+_ENV_RE = re.compile(r'\$\{([^}]+)\}')
+
+# Joins references in the template sent to `op inject`, then splits its output
+_INJECT_SEPARATOR = "\x1e"
+
+# Retries for idempotent requests that fail transiently (connect errors, 429/502/503/504)
+DEFAULT_RETRIES = 3
+DEFAULT_RETRY_BACKOFF = 0.2  # seconds before the first retry, doubling each time
 
-@dataclass
+# Client-side caching of metadata requests (labels, label values, tags)
+CACHE_LEVELS = ("none", "low", "med", "high")
+
+
+@dataclass(slots=True, frozen=True)
 class ServiceConfig:
     url: str
     token: str | None = None
     username: str | None = None
-    headers: dict[str, str] | None = None
+    headers: tuple[tuple[str, str], ...] | None = None  # (name, value) pairs
+    cache_level: str = "none"  # one of CACHE_LEVELS
+    retries: int = DEFAULT_RETRIES
+    retry_backoff: float = DEFAULT_RETRY_BACKOFF
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class InstanceConfig:
     name: str
     loki: ServiceConfig | None = None
@@ -27,11 +51,11 @@ class InstanceConfig:
     alerting: ServiceConfig | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Config:
     version: str
     default_instance: str | None
-    instances: dict[str, InstanceConfig]
+    instances: Mapping[str, InstanceConfig]
 
     def get_instance(self, name: str | None = None) -> InstanceConfig:
         if name:
@@ -43,6 +67,10 @@ class Config:
         return next(iter(self.instances.values()))
 
 
+# 1Password reference -> secret value, for this process
+_resolved_refs: dict[str, str] = {}
+
+
 def resolve_1password_ref(ref: str) -> str:
     """Resolve a 1Password reference using the op CLI.
 
@@ -55,6 +83,8 @@ def resolve_1password_ref(ref: str) -> str:
     Raises:
         RuntimeError: If op CLI fails or is not available
     """
+    if ref in _resolved_refs:
+        return _resolved_refs[ref]
     try:
         result = subprocess.run(
             ["op", "read", ref],
@@ -62,13 +92,54 @@ def resolve_1password_ref(ref: str) -> str:
             text=True,
             check=True,
         )
-        return result.stdout.strip()
+        value = _resolved_refs[ref] = result.stdout.strip()
+        return value
     except FileNotFoundError:
         raise RuntimeError("1Password CLI (op) not found. Install it from https://1password.com/downloads/command-line/")
     except subprocess.CalledProcessError as e:
         raise RuntimeError(f"Failed to read from 1Password: {e.stderr.strip()}")
 
 
+def _find_1password_refs(data) -> list[str]:
+    """Collect every 1Password reference in parsed config data."""
+    if isinstance(data, str):
+        return [data] if data.startswith("op://") else _OP_RE.findall(data)
+    if isinstance(data, dict):
+        data = data.values()
+    elif not isinstance(data, list):
+        return []
+    return [ref for item in data for ref in _find_1password_refs(item)]
+
+
+def prefetch_1password_refs(refs: list[str]) -> None:
+    """Resolve many 1Password references with a single `op inject` call.
+
+    Each `op read` is a separate process and vault round-trip, so resolving
+    them together saves most of the start-up time of configs with several
+    references. Results are remembered for resolve_1password_ref(); if the
+    batch fails, references are left to be read one at a time as before.
+    """
+    pending = [ref for ref in dict.fromkeys(refs) if ref not in _resolved_refs]
+    if len(pending) < 2:
+        return
+    template = _INJECT_SEPARATOR.join(f"{{{{ {ref} }}}}" for ref in pending)
+    try:
+        result = subprocess.run(
+            ["op", "inject"],
+            input=template,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return
+    values = result.stdout.split(_INJECT_SEPARATOR)
+    if len(values) != len(pending):
+        return
+    for ref, value in zip(pending, values):
+        _resolved_refs[ref] = value.strip()
+
+
 def resolve_secret(value: str) -> str:
     """Resolve secrets from environment variables or 1Password.
 
@@ -86,14 +157,17 @@ def resolve_secret(value: str) -> str:
     if value.startswith("op://"):
         return resolve_1password_ref(value)
 
+    # Most values (URLs, usernames) have no placeholders at all
+    if "${" not in value:
+        return value
+
     # Handle ${op://...} pattern for 1Password within strings
-    op_pattern = r'\$\{(op://[^}]+)\}'
     def replace_op(match):
         return resolve_1password_ref(match.group(1))
-    value = re.sub(op_pattern, replace_op, value)
+    if "${op://" in value:
+        value = _OP_RE.sub(replace_op, value)
 
     # Handle ${VAR_NAME} pattern for environment variables
-    env_pattern = r'\$\{([^}]+)\}'
     def replace_env(match):
         var_name = match.group(1)
         resolved = os.environ.get(var_name)
@@ -102,45 +176,108 @@ def resolve_secret(value: str) -> str:
             click.echo(f"Warning: Environment variable '{var_name}' is not set", err=True)
             return ""
         return resolved
-    return re.sub(env_pattern, replace_env, value)
+    return _ENV_RE.sub(replace_env, value)
 
 
 def parse_service_config(data: dict | None) -> ServiceConfig | None:
     if not data:
         return None
+    cache_level = data.get("cache_level", "none")
+    if cache_level not in CACHE_LEVELS:
+        raise ValueError(f"Invalid cache_level '{cache_level}', expected one of: {', '.join(CACHE_LEVELS)}")
+    retries = int(data.get("retries", DEFAULT_RETRIES))
+    if retries < 0:
+        raise ValueError(f"Invalid retries {retries}, expected 0 or more")
+    retry_backoff = float(data.get("retry_backoff", DEFAULT_RETRY_BACKOFF))
+    if retry_backoff < 0:
+        raise ValueError(f"Invalid retry_backoff {retry_backoff}, expected 0 or more")
     return ServiceConfig(
         url=resolve_secret(data.get("url", "")),
         token=resolve_secret(data["token"]) if data.get("token") else None,
         username=resolve_secret(data["username"]) if data.get("username") else None,
-        headers={k: resolve_secret(v) for k, v in data.get("headers", {}).items()} or None,
+        headers=tuple((k, resolve_secret(v)) for k, v in data.get("headers", {}).items()) or None,
+        cache_level=cache_level,
+        retries=retries,
+        retry_backoff=retry_backoff,
+    )
+
+
+def parse_instance_config(name: str, data: dict) -> InstanceConfig:
+    # Fetch all of this instance's 1Password secrets in one go before parsing
+    prefetch_1password_refs(_find_1password_refs(data))
+    return InstanceConfig(
+        name=name,
+        loki=parse_service_config(data.get("loki")),
+        prometheus=parse_service_config(data.get("prometheus")),
+        tempo=parse_service_config(data.get("tempo")),
+        alerting=parse_service_config(data.get("alerting")),
     )
 
 
+class LazyInstances(Mapping):
+    """Instance configs that are parsed, and have their secrets resolved, on first lookup.
+
+    A command only talks to one instance, so the others' env vars and
+    1Password references are never touched.
+    """
+
+    def __init__(self, raw: dict[str, dict]):
+        self._raw = raw
+        self._parsed: dict[str, InstanceConfig] = {}
+
+    def prefetch_secrets(self) -> None:
+        """Fetch every instance's 1Password references with one `op inject` call.
+
+        For callers about to parse all instances, which would otherwise
+        batch them per instance.
+        """
+        prefetch_1password_refs(_find_1password_refs(self._raw))
+
+    def __getitem__(self, name: str) -> InstanceConfig:
+        if name not in self._parsed:
+            self._parsed[name] = parse_instance_config(name, self._raw[name])
+        return self._parsed[name]
+
+    def __contains__(self, name) -> bool:
+        return name in self._raw
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+
+def read_yaml(path: Path):
+    """Parse a YAML file safely, using the libyaml C parser when available."""
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=_SafeLoader)
+
+
 def load_config(path: Path | None = None) -> Config:
     config_path = path or DEFAULT_CONFIG_PATH
-    if not config_path.exists():
-        raise FileNotFoundError(f"Config file not found: {config_path}")
+    try:
+        mtime_ns = config_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config file not found: {config_path}") from None
+    return _load_config(config_path.resolve(), mtime_ns)
 
-    with open(config_path) as f:
-        data = yaml.safe_load(f)
 
-    instances = {}
-    for name, instance_data in data.get("instances", {}).items():
-        instances[name] = InstanceConfig(
-            name=name,
-            loki=parse_service_config(instance_data.get("loki")),
-            prometheus=parse_service_config(instance_data.get("prometheus")),
-            tempo=parse_service_config(instance_data.get("tempo")),
-            alerting=parse_service_config(instance_data.get("alerting")),
-        )
+@functools.lru_cache(maxsize=8)
+def _load_config(config_path: Path, mtime_ns: int) -> Config:
+    """Parse a config file; cached per (path, mtime) so edits are picked up on the next load."""
+    data = read_yaml(config_path)
 
     return Config(
         version=data.get("version", "1"),
         default_instance=data.get("default_instance"),
-        instances=instances,
+        instances=LazyInstances(data.get("instances", {})),
     )
 
 
+load_config.cache_clear = _load_config.cache_clear
+
+
 def generate_stack_instances(stacks: list[dict], token_ref: str) -> dict[str, dict]:
     """Generate instance config dicts from Grafana Cloud stack API responses."""
     instances = {}
@@ -0,0 +1,33 @@
+"""Opt-in wall-clock breakdown of one invocation (--profile or LGTM_PROFILE=1)."""
+
+import sys
+import time
+from contextlib import contextmanager
+
+enabled = False
+# phase -> [calls, total nanoseconds], in the order phases first ran
+_totals: dict[str, list[int]] = {}
+
+
+@contextmanager
+def span(name: str):
+    """Time the enclosed block under `name` when timing is enabled."""
+    if not enabled:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        entry = _totals.setdefault(name, [0, 0])
+        entry[0] += 1
+        entry[1] += time.perf_counter_ns() - start
+
+
+def report(file=None) -> None:
+    """Print the recorded phases as a table (stderr by default)."""
+    file = file or sys.stderr
+    width = max(map(len, _totals), default=5)
+    print(f"{'phase':<{width}}  calls  total ms", file=file)
+    for name, (calls, total_ns) in _totals.items():
+        print(f"{name:<{width}}  {calls:>5}  {total_ns / 1e6:>8.2f}", file=file)
@@ -0,0 +1,15 @@
+import pytest
+
+from lgtm_cli import cli
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize("compact", [True, False])
+def test_dumps_emits_utf8_with_or_without_orjson(monkeypatch, use_orjson, compact):
+    if not use_orjson:
+        monkeypatch.setattr(cli, "orjson", None)
+    elif cli.orjson is None:
+        pytest.skip("orjson not installed")
+    out = cli._dumps({"msg": "héllo ✓"}, compact=compact)
+    assert "héllo ✓".encode() in out
+    assert out.endswith(b"\n")
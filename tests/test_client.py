@@ -0,0 +1,339 @@
+import httpx
+import pytest
+
+from lgtm_cli import client as client_module
+from lgtm_cli.client import LGTMClient
+from lgtm_cli.config import ServiceConfig, parse_service_config
+
+
+def make_client(handler, cls=LGTMClient, **config):
+    c = cls(ServiceConfig(url="http://backend", **config))
+    c._client = httpx.Client(base_url=c.base_url, transport=httpx.MockTransport(handler))
+    return c
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(client_module.time, "sleep", delays.append)
+    return delays
+
+
+def test_retries_status_then_succeeds(sleeps):
+    statuses = iter([503, 502, 200])
+
+    def handler(request):
+        status = next(statuses)
+        return httpx.Response(status, json={"status": "success"} if status == 200 else None)
+
+    c = make_client(handler, retries=3, retry_backoff=0.1)
+    assert c.get("/api/v1/labels") == {"status": "success"}
+    assert len(sleeps) == 2
+    assert 0.1 <= sleeps[0] <= 0.2
+    assert 0.2 <= sleeps[1] <= 0.3
+
+
+def test_retry_after_is_honoured(sleeps):
+    responses = iter([
+        httpx.Response(429, headers={"Retry-After": "2"}),
+        httpx.Response(200, json={"ok": True}),
+    ])
+    c = make_client(lambda request: next(responses))
+    assert c.get("/api/v1/labels") == {"ok": True}
+    assert sleeps == [2.0]
+
+
+def test_retry_after_is_capped(sleeps):
+    responses = iter([
+        httpx.Response(503, headers={"Retry-After": "120"}),
+        httpx.Response(200, json={}),
+    ])
+    make_client(lambda request: next(responses)).get("/")
+    assert sleeps == [client_module.RETRY_MAX_DELAY]
+
+
+def test_retries_exhausted_raises_last_status(sleeps):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    c = make_client(handler, retries=2)
+    with pytest.raises(httpx.HTTPStatusError) as exc_info:
+        c.get("/api/v1/labels")
+    assert exc_info.value.response.status_code == 503
+    assert len(calls) == 3
+    assert len(sleeps) == 2
+
+
+def test_transport_errors_are_retried(sleeps):
+    errors = iter([httpx.ConnectError("refused"), httpx.ReadTimeout("timed out")])
+
+    def handler(request):
+        error = next(errors, None)
+        if error:
+            raise error
+        return httpx.Response(200, json={"ok": True})
+
+    assert make_client(handler).get("/") == {"ok": True}
+    assert len(sleeps) == 2
+
+
+def test_transport_errors_exhausted_raise(sleeps):
+    def handler(request):
+        raise httpx.RemoteProtocolError("server disconnected")
+
+    with pytest.raises(httpx.RemoteProtocolError):
+        make_client(handler, retries=1).get("/")
+    assert len(sleeps) == 1
+
+
+def test_other_statuses_are_not_retried(sleeps):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(400)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        make_client(handler).get("/")
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_zero_retries_sends_once(sleeps):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        make_client(handler, retries=0).get("/")
+    assert len(calls) == 1
+
+
+def test_async_retries_status_then_succeeds(monkeypatch):
+    import asyncio
+
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    statuses = iter([504, 200])
+
+    def handler(request):
+        status = next(statuses)
+        return httpx.Response(status, json={"ok": True} if status == 200 else None)
+
+    c = LGTMClient(ServiceConfig(url="http://backend"))
+    c._async_client = httpx.AsyncClient(base_url=c.base_url, transport=httpx.MockTransport(handler))
+    assert asyncio.run(c.aget("/")) == {"ok": True}
+    assert len(delays) == 1
+
+
+@pytest.mark.parametrize("field", ["retries", "retry_backoff"])
+def test_negative_retry_settings_are_rejected(field):
+    with pytest.raises(ValueError, match=field):
+        parse_service_config({"url": "http://backend", field: -1})
+
+
+def loki_backend(entries, pages):
+    """Serve (labels, ts, line) entries from /loki/api/v1/query_range like Loki does.
+
+    start is inclusive and end exclusive; entries sharing a timestamp keep a
+    stable order. The limit of every request is appended to `pages`.
+    """
+    def handler(request):
+        params = request.url.params
+        start, end, limit = int(params["start"]), int(params["end"]), int(params["limit"])
+        backward = params["direction"] == "backward"
+        matching = [e for e in entries if start <= e[1] < end]
+        matching.sort(key=lambda e: -e[1] if backward else e[1])
+        pages.append(limit)
+        streams = {}
+        for labels, ts, line in matching[:limit]:
+            streams.setdefault(labels, []).append([str(ts), line])
+        result = [{"stream": dict(labels), "values": values} for labels, values in streams.items()]
+        return httpx.Response(200, json={"status": "success", "data": {"resultType": "streams", "result": result}})
+
+    return handler
+
+
+def flatten(streams):
+    return [(tuple(s["stream"].items()), int(ts), line) for s in streams for ts, line in s["values"]]
+
+
+# 13 entries over two streams, many of them sharing a timestamp
+APP_A = (("app", "a"),)
+APP_B = (("app", "b"),)
+DUPLICATE_ENTRIES = (
+    [(APP_A, 100, f"a{i}") for i in range(5)]
+    + [(APP_B, 100, f"b{i}") for i in range(3)]
+    + [(APP_A, 90, "a-old"), (APP_B, 90, "b-old")]
+    + [(APP_A, 110, "a-new"), (APP_A, 80, "a-oldest"), (APP_B, 120, "b-newest")]
+)
+
+
+@pytest.mark.parametrize("direction", ["backward", "forward"])
+@pytest.mark.parametrize("chunk", [1, 3, 4, 5, 13, 100])
+def test_loki_paging_with_duplicate_timestamps(direction, chunk):
+    from lgtm_cli.client import LokiClient
+
+    pages = []
+    c = make_client(loki_backend(DUPLICATE_ENTRIES, pages), LokiClient)
+    got = flatten(c.iter_query_range("{app=~\".+\"}", "0", "1000", chunk=chunk, direction=direction))
+    assert sorted(got) == sorted(DUPLICATE_ENTRIES)
+    # results are grouped by stream per page, so order only holds within a stream
+    for labels in (APP_A, APP_B):
+        timestamps = [ts for stream, ts, _ in got if stream == labels]
+        assert timestamps == sorted(timestamps, reverse=direction == "backward")
+
+
+@pytest.mark.parametrize("direction", ["backward", "forward"])
+@pytest.mark.parametrize("limit", [1, 4, 7, 12, 13, 50])
+def test_loki_paging_respects_limit(direction, limit):
+    from lgtm_cli.client import LokiClient
+
+    c = make_client(loki_backend(DUPLICATE_ENTRIES, []), LokiClient)
+    got = flatten(c.iter_query_range("{}", "0", "1000", chunk=3, direction=direction, limit=limit))
+    assert len(got) == min(limit, len(DUPLICATE_ENTRIES))
+    assert len(set(got)) == len(got)
+
+
+def test_loki_paging_requests_at_most_chunk_new_entries():
+    from lgtm_cli.client import LokiClient
+
+    entries = [(APP_A, ts, str(ts)) for ts in range(10)]
+    pages = []
+    c = make_client(loki_backend(entries, pages), LokiClient)
+    assert len(flatten(c.iter_query_range("{}", "0", "1000", chunk=4))) == 10
+    # after the first page, one boundary entry is asked for again
+    assert pages == [4, 5, 5]
+
+
+def test_empty_params_are_left_out():
+    from lgtm_cli.client import LokiClient, TempoClient
+
+    urls = []
+
+    def handler(request):
+        urls.append(request.url)
+        return httpx.Response(200, json={})
+
+    make_client(handler, LokiClient).labels(start="", end=None)
+    make_client(handler, LokiClient).query_instant("", time="")
+    make_client(handler, TempoClient).search(None, start="", end="1", limit=0)
+    assert [str(url.params) for url in urls] == ["", "query=", "limit=0&end=1"]
+
+
+@pytest.mark.parametrize("value, up, expected", [
+    ("1700000030", False, "1699999800"),
+    ("1700000030", True, "1700000400"),
+    ("1700000400", True, "1700000400"),
+    ("2024-01-15T10:07:30Z", False, "2024-01-15T10:00:00Z"),
+    ("2024-01-15T10:07:30Z", True, "2024-01-15T10:10:00Z"),
+    ("2024-01-15T12:07:30+02:00", False, "2024-01-15T10:00:00Z"),
+    ("2024-01-15T12:07:30+02:00", True, "2024-01-15T10:10:00Z"),
+])
+def test_snap_time_rounds_to_step(value, up, expected):
+    assert client_module._snap_time(value, 600, up=up) == expected
+
+
+@pytest.mark.parametrize("value", [
+    "2024-01-15T10:07:30",  # naive: timezone unknown
+    "1700000030123456789",  # nanoseconds
+    "1700000030.5",
+    "now-1h",
+    "",
+])
+def test_snap_time_leaves_other_formats_alone(value):
+    assert client_module._snap_time(value, 600, up=False) == value
+    assert client_module._snap_time(value, 600, up=True) == value
+
+
+def test_snap_range_widens_only_start_and_end():
+    params = [("match[]", "up"), ("start", "1700000030"), ("end", "1700000030"), ("limit", 5)]
+    assert client_module._snap_range(params, 60) == [
+        ("match[]", "up"), ("start", "1699999980"), ("end", "1700000040"), ("limit", 5),
+    ]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(client_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_ttl_cache_expires_entries(clock):
+    cache = client_module._TTLCache(ttl=60)
+    cache.set(("k",), "v")
+    clock[0] += 60
+    assert cache.get(("k",)) == "v"
+    clock[0] += 1
+    assert cache.get(("k",)) is None
+
+
+def test_ttl_cache_evicts_least_recently_used(clock):
+    cache = client_module._TTLCache(ttl=60, maxsize=2)
+    cache.set(("a",), 1)
+    cache.set(("b",), 2)
+    cache.get(("a",))
+    cache.set(("c",), 3)
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == 1
+    assert cache.get(("c",)) == 3
+
+
+def counting_backend(requests):
+    def handler(request):
+        requests.append(request.url)
+        return httpx.Response(200, json={"status": "success", "data": [str(len(requests))]})
+
+    return handler
+
+
+def test_get_cached_reuses_nearby_ranges(clock):
+    from lgtm_cli.client import LokiClient
+
+    requests = []
+    c = make_client(counting_backend(requests), LokiClient, cache_level="low")
+    first = c.labels(start="1700000005", end="1700000010")
+    assert c.labels(start="1700000015", end="1700000035") == first
+    assert len(requests) == 1
+    # the widened range is what the backend sees
+    assert requests[0].params["start"] == "1699999980"
+    assert requests[0].params["end"] == "1700000040"
+    c.labels(start="1700000065", end="1700000070")
+    assert len(requests) == 2
+
+
+def test_get_cached_refetches_after_ttl(clock):
+    from lgtm_cli.client import LokiClient
+
+    requests = []
+    c = make_client(counting_backend(requests), LokiClient, cache_level="low")
+    c.labels()
+    clock[0] += 61
+    c.labels()
+    assert len(requests) == 2
+
+
+@pytest.mark.parametrize("cache_level, raw", [("none", False), ("high", True)])
+def test_get_cached_bypassed(clock, cache_level, raw):
+    from lgtm_cli.client import LokiClient
+
+    requests = []
+    c = make_client(counting_backend(requests), LokiClient, cache_level=cache_level)
+    c.raw = raw
+    for _ in range(2):
+        result = c.labels(start="1700000005", end="1700000010")
+        if raw:
+            b"".join(result)
+    assert len(requests) == 2
+    # times are sent as given
+    assert requests[0].params["start"] == "1700000005"
@@ -0,0 +1,126 @@
+import subprocess
+
+import pytest
+
+from lgtm_cli import config as config_module
+from lgtm_cli.config import (
+    _find_1password_refs,
+    parse_instance_config,
+    prefetch_1password_refs,
+    resolve_secret,
+)
+
+SEPARATOR = config_module._INJECT_SEPARATOR
+
+
+@pytest.fixture(autouse=True)
+def resolved_refs(monkeypatch):
+    refs = {}
+    monkeypatch.setattr(config_module, "_resolved_refs", refs)
+    return refs
+
+
+class FakeOp:
+    """Stand-in for subprocess.run that answers `op read` and `op inject` and records each call."""
+
+    def __init__(self, inject=None):
+        self.calls = []
+        self.inject = inject or self.inject_all
+
+    @staticmethod
+    def value(ref):
+        return "secret-" + ref.rsplit("/", 1)[-1]
+
+    def inject_all(self, template):
+        return SEPARATOR.join(self.value(part.strip("{} ")) + "\n" for part in template.split(SEPARATOR))
+
+    def __call__(self, args, input=None, **kwargs):
+        self.calls.append(args)
+        if args[1] == "read":
+            return subprocess.CompletedProcess(args, 0, stdout=self.value(args[2]) + "\n", stderr="")
+        return subprocess.CompletedProcess(args, 0, stdout=self.inject(input), stderr="")
+
+
+@pytest.fixture
+def op(monkeypatch):
+    fake = FakeOp()
+    monkeypatch.setattr(config_module.subprocess, "run", fake)
+    return fake
+
+
+def test_find_refs_collects_whole_and_embedded_references():
+    data = {
+        "loki": {
+            "url": "https://${op://vault/loki/host}/loki",
+            "token": "op://vault/loki/token",
+            "headers": {"X-Scope-OrgID": "${op://vault/org/a}-${op://vault/org/b}", "X-Plain": "value"},
+        },
+        "retries": 3,
+        "extra": ["op://vault/list/item", None],
+    }
+    assert sorted(_find_1password_refs(data)) == [
+        "op://vault/list/item",
+        "op://vault/loki/host",
+        "op://vault/loki/token",
+        "op://vault/org/a",
+        "op://vault/org/b",
+    ]
+
+
+def test_prefetch_resolves_all_refs_with_one_inject(op, resolved_refs):
+    prefetch_1password_refs(["op://v/i/one", "op://v/i/two", "op://v/i/one", "op://v/i/three"])
+    assert op.calls == [["op", "inject"]]
+    assert resolved_refs == {
+        "op://v/i/one": "secret-one",
+        "op://v/i/two": "secret-two",
+        "op://v/i/three": "secret-three",
+    }
+    assert resolve_secret("op://v/i/two") == "secret-two"
+    assert resolve_secret("Bearer ${op://v/i/three}") == "Bearer secret-three"
+    assert len(op.calls) == 1
+
+
+def test_prefetch_skips_refs_already_resolved(op, resolved_refs):
+    resolved_refs["op://v/i/one"] = "cached"
+    prefetch_1password_refs(["op://v/i/one", "op://v/i/two"])
+    # only one ref left, which a plain `op read` handles later
+    assert op.calls == []
+
+
+def test_prefetch_count_mismatch_falls_back_to_op_read(op, resolved_refs):
+    op.inject = lambda template: "everything on one line"
+    prefetch_1password_refs(["op://v/i/one", "op://v/i/two"])
+    assert resolved_refs == {}
+    assert resolve_secret("op://v/i/one") == "secret-one"
+    assert op.calls == [["op", "inject"], ["op", "read", "op://v/i/one"]]
+
+
+def test_prefetch_inject_failure_falls_back_to_op_read(op, resolved_refs):
+    def fail(template):
+        raise subprocess.CalledProcessError(1, ["op", "inject"], stderr="not signed in")
+
+    op.inject = fail
+    prefetch_1password_refs(["op://v/i/one", "op://v/i/two"])
+    assert resolved_refs == {}
+    assert resolve_secret("op://v/i/two") == "secret-two"
+    assert op.calls[-1] == ["op", "read", "op://v/i/two"]
+
+
+def test_prefetch_without_op_cli_is_silent(monkeypatch, resolved_refs):
+    def missing(*args, **kwargs):
+        raise FileNotFoundError("op")
+
+    monkeypatch.setattr(config_module.subprocess, "run", missing)
+    prefetch_1password_refs(["op://v/i/one", "op://v/i/two"])
+    assert resolved_refs == {}
+
+
+def test_parse_instance_config_resolves_instance_with_one_call(op):
+    instance = parse_instance_config("prod", {
+        "loki": {"url": "https://loki", "username": "op://v/loki/user", "token": "op://v/loki/token"},
+        "tempo": {"url": "https://tempo", "headers": {"X-Scope-OrgID": "${op://v/tempo/org}"}},
+    })
+    assert op.calls == [["op", "inject"]]
+    assert instance.loki.username == "secret-user"
+    assert instance.loki.token == "secret-token"
+    assert instance.tempo.headers == (("X-Scope-OrgID", "secret-org"),)